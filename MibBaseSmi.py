@@ -0,0 +1,56 @@
+"""
+precompiled base SMI modules (RFC1155-SMI, SNMPv2-SMI, ...) which almost every mib imports.
+
+their text and scan tables are shipped in MibBaseTables, so a corpus made with base_smi (see MibCorpus) has them
+in its modules registry from the start: imports of them are resolved without locating, reading or scanning any file.
+the tables are generated from the module files by:
+
+    python -m MibBaseSmi MibBaseTables.py tests/RFC1155-SMI.my [SNMPv2-SMI.my SNMPv2-TC.my ...]
+"""
+from __future__ import annotations
+
+import pprint
+import sys
+from pathlib import Path
+from typing import Iterable, Union
+
+from MibLexer import MibScan
+
+pathType = Union[str, Path]
+
+# directory of the (not existing) files of base modules, so they have paths like modules made from files
+base_dir = Path(__file__).resolve().parent / 'base-smi'
+
+
+def compile_module(path: pathType) -> dict:
+    """ tables of the module in mib file: its scan (see MibScan.tables), 'file' name and 'text' """
+    with open(path) as f:
+        text = f.read()
+    return {**MibScan(text).tables(), 'file': Path(path).name, 'text': text}
+
+
+def write_tables(paths: Iterable[pathType], dest: pathType):
+    """ write the tables of the modules of mib files as python module dest """
+    tables = {}
+    for path in paths:
+        module = compile_module(path)
+        tables[module['name']] = module
+    with open(dest, 'w') as f:
+        f.write(f'# generated by: python -m MibBaseSmi {Path(dest).name} '
+                f'{" ".join(Path(path).as_posix() for path in paths)}\n')
+        f.write('# {moduleName:{file, text, name, regions, imported_idrs, defined_idrs, oid_values, children}}\n'
+                '# see MibBaseSmi\n')
+        f.write(f'tables = {pprint.pformat(tables, width=120, sort_dicts=False)}\n')
+
+
+def base_modules() -> Iterable[tuple[Path, MibScan, str]]:
+    """ (path, scan, text) of each precompiled module """
+    from MibBaseTables import tables
+    for module in tables.values():
+        yield base_dir / module['file'], MibScan.from_tables(module), module['text']
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        sys.exit(f'usage: python -m MibBaseSmi <tables.py> <mib files...>')
+    write_tables(sys.argv[2:], sys.argv[1])
@@ -0,0 +1,161 @@
+# generated by: python -m MibBaseSmi MibBaseTables.py tests/RFC1155-SMI.my
+# {moduleName:{file, text, name, regions, imported_idrs, defined_idrs, oid_values, children}}
+# see MibBaseSmi
+tables = {'RFC1155-SMI': {'name': 'RFC1155-SMI',
+                 'regions': {'START': (0, 33), 'EXPORTS': (35, 293), 'DEFS': (293, 3076)},
+                 'imported_idrs': {},
+                 'defined_idrs': {'internet': (322, 381, 'oid'),
+                                  'directory': (384, 434, 'oid'),
+                                  'mgmt': (437, 487, 'oid'),
+                                  'experimental': (490, 540, 'oid'),
+                                  'private': (543, 593, 'oid'),
+                                  'enterprises': (595, 644, 'oid'),
+                                  'ObjectName': (1176, 1216, 'type'),
+                                  'ObjectSyntax': (1259, 1671, 'type'),
+                                  'SimpleSyntax': (1680, 1942, 'type'),
+                                  'ApplicationSyntax': (1951, 2358, 'type'),
+                                  'NetworkAddress': (2402, 2506, 'type'),
+                                  'IpAddress': (2515, 2637, 'type'),
+                                  'Counter': (2646, 2732, 'type'),
+                                  'Gauge': (2741, 2825, 'type'),
+                                  'TimeTicks': (2834, 2922, 'type'),
+                                  'Opaque': (2931, 3040, 'type')},
+                 'oid_values': {'internet': (('iso', None), ('org', 3), ('dod', 6), (None, 1)),
+                                'directory': (('internet', None), (None, 1)),
+                                'mgmt': (('internet', None), (None, 2)),
+                                'experimental': (('internet', None), (None, 3)),
+                                'private': (('internet', None), (None, 4)),
+                                'enterprises': (('private', None), (None, 1))},
+                 'children': {'iso': ['internet'],
+                              'internet': ['directory', 'mgmt', 'experimental', 'private'],
+                              'private': ['enterprises']},
+                 'file': 'RFC1155-SMI.my',
+                 'text': 'RFC1155-SMI DEFINITIONS ::= BEGIN\n'
+                         '\n'
+                         'EXPORTS -- EVERYTHING\n'
+                         '        internet, directory, mgmt,\n'
+                         '        experimental, private, enterprises,\n'
+                         '        OBJECT-TYPE, ObjectName, ObjectSyntax, SimpleSyntax,\n'
+                         '        ApplicationSyntax, NetworkAddress, IpAddress,\n'
+                         '        Counter, Gauge, TimeTicks, Opaque;\n'
+                         '\n'
+                         ' -- the path to the root\n'
+                         '\n'
+                         ' internet      OBJECT IDENTIFIER ::= { iso org(3) dod(6) 1 }\n'
+                         '\n'
+                         ' directory     OBJECT IDENTIFIER ::= { internet 1 }\n'
+                         '\n'
+                         ' mgmt          OBJECT IDENTIFIER ::= { internet 2 }\n'
+                         '\n'
+                         ' experimental  OBJECT IDENTIFIER ::= { internet 3 }\n'
+                         '\n'
+                         ' private       OBJECT IDENTIFIER ::= { internet 4 }\n'
+                         ' enterprises   OBJECT IDENTIFIER ::= { private 1 }\n'
+                         '\n'
+                         '\n'
+                         ' -- definition of object types\n'
+                         '\n'
+                         ' OBJECT-TYPE MACRO ::=\n'
+                         ' BEGIN\n'
+                         '     TYPE NOTATION ::= "SYNTAX" type (TYPE ObjectSyntax)\n'
+                         '                       "ACCESS" Access\n'
+                         '                       "STATUS" Status\n'
+                         '     VALUE NOTATION ::= value (VALUE ObjectName)\n'
+                         '\n'
+                         '     Access ::= "read-only"\n'
+                         '                     | "read-write"\n'
+                         '                     | "write-only"\n'
+                         '                     | "not-accessible"\n'
+                         '     Status ::= "mandatory"\n'
+                         '                     | "optional"\n'
+                         '                     | "obsolete"\n'
+                         ' END\n'
+                         '\n'
+                         '    -- names of objects in the MIB\n'
+                         '\n'
+                         '    ObjectName ::=\n'
+                         '        OBJECT IDENTIFIER\n'
+                         '\n'
+                         '    -- syntax of objects in the MIB\n'
+                         '\n'
+                         '    ObjectSyntax ::=\n'
+                         '        CHOICE {\n'
+                         '            simple\n'
+                         '                SimpleSyntax,\n'
+                         '\n'
+                         '    -- note that simple SEQUENCEs are not directly\n'
+                         '    -- mentioned here to keep things simple (i.e.,\n'
+                         '    -- prevent mis-use).  However, application-wide\n'
+                         '    -- types which are IMPLICITly encoded simple\n'
+                         '    -- SEQUENCEs may appear in the following CHOICE\n'
+                         '\n'
+                         '            application-wide\n'
+                         '                ApplicationSyntax\n'
+                         '        }\n'
+                         '\n'
+                         '       SimpleSyntax ::=\n'
+                         '           CHOICE {\n'
+                         '               number\n'
+                         '                   INTEGER,\n'
+                         '\n'
+                         '               string\n'
+                         '                   OCTET STRING,\n'
+                         '\n'
+                         '               object\n'
+                         '                   OBJECT IDENTIFIER,\n'
+                         '\n'
+                         '               empty\n'
+                         '                   NULL\n'
+                         '           }\n'
+                         '\n'
+                         '       ApplicationSyntax ::=\n'
+                         '           CHOICE {\n'
+                         '               address\n'
+                         '                   NetworkAddress,\n'
+                         '\n'
+                         '               counter\n'
+                         '                   Counter,\n'
+                         '\n'
+                         '               gauge\n'
+                         '                   Gauge,\n'
+                         '\n'
+                         '               ticks\n'
+                         '                   TimeTicks,\n'
+                         '\n'
+                         '               arbitrary\n'
+                         '                   Opaque\n'
+                         '\n'
+                         '       -- other application-wide types, as they are\n'
+                         '       -- defined, will be added here\n'
+                         '           }\n'
+                         '\n'
+                         '\n'
+                         '       -- application-wide types\n'
+                         '\n'
+                         '       NetworkAddress ::=\n'
+                         '           CHOICE {\n'
+                         '               internet\n'
+                         '                   IpAddress\n'
+                         '           }\n'
+                         '\n'
+                         '       IpAddress ::=\n'
+                         '           [APPLICATION 0]          -- in network-byte order\n'
+                         '               IMPLICIT OCTET STRING (SIZE (4))\n'
+                         '\n'
+                         '       Counter ::=\n'
+                         '           [APPLICATION 1]\n'
+                         '               IMPLICIT INTEGER (0..4294967295)\n'
+                         '\n'
+                         '       Gauge ::=\n'
+                         '           [APPLICATION 2]\n'
+                         '               IMPLICIT INTEGER (0..4294967295)\n'
+                         '\n'
+                         '       TimeTicks ::=\n'
+                         '           [APPLICATION 3]\n'
+                         '               IMPLICIT INTEGER (0..4294967295)\n'
+                         '\n'
+                         '       Opaque ::=\n'
+                         '           [APPLICATION 4]          -- arbitrary ASN.1 value,\n'
+                         '               IMPLICIT OCTET STRING   --   "double-wrapped"\n'
+                         '\n'
+                         '       END'}}
@@ -0,0 +1,266 @@
+"""
+batch building of many modules from a manifest.
+
+    python -m MibParser build manifest.json [--jobs N] [--report report.json] [--state-dir DIR [--verify]]
+                                           [--verbose]
+
+manifest (json):
+
+    {
+        "mibs_paths": ["mibs/*.my"],
+        "mibs_dirs": ["/usr/share/snmp/mibs"],
+        "fast_load": true,
+        "cache_dir": ".mib-cache",
+        "out_dir": "out",
+        "base_smi": true,
+        "emit_base": true,
+        "targets": [
+            {"name": "router-mib", "idrs_list": ["sysObjectID", "ifIndex"]},
+            {"name": "switch-mib", "idrs_dict": {"dot1xPaeSystemAuthControl": "mibs/IEEE8021-PAE-MIB.my"},
+             "mibs_paths": [], "out": "switch.my"}
+        ]
+    }
+
+every field except "targets" is optional. a target "mibs_paths" replaces the manifest one and its output is "out" or
+'<out_dir>/<name>.my'. paths are relative to the current directory.
+
+the corpus of the targets is loaded and indexed once, and the targets are built by worker processes which share the
+index ("cache_dir", a temporary one if not given). each worker loads a corpus once and reuses it for all its targets.
+a target which fails (an identifier not found, a file which can't be read) doesn't stop the others, its error is
+reported and the exit status is 1.
+
+with --state-dir the build of each target is recorded in '<state dir>/<name>.build.json' and the next build of the
+target rebuilds it incrementally (see MibParser build_manifest). --verify also builds every target from scratch and
+fails if any output is different.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields, asdict, replace, MISSING
+from glob import glob
+from typing import Optional, Union
+
+from MibParser import MibParser, MibCorpus, FAST_LOAD
+
+logger = logging.getLogger('MibParser.build')
+
+
+def check_fields(cls, data, where: str):
+    """ raise ValueError if json object data has fields which dataclass cls doesn't have or misses its required ones """
+    if not isinstance(data, dict):
+        raise ValueError(f'{where} must be a json object')
+    names = [f.name for f in fields(cls)]
+    unknown = [name for name in data if name not in names]
+    if unknown:
+        raise ValueError(f'unknown field {", ".join(map(repr, unknown))} in {where}, expected: {", ".join(names)}')
+    missing = [f.name for f in fields(cls)
+               if f.default is MISSING and f.default_factory is MISSING and f.name not in data]
+    if missing:
+        raise ValueError(f'missing field {", ".join(map(repr, missing))} in {where}')
+
+
+@dataclass
+class Target:
+    """ module to build """
+    name: str
+    idrs_list: list[str] = field(default_factory=list)
+    idrs_dict: dict[str, str] = field(default_factory=dict)
+    mibs_paths: Optional[list[str]] = None
+    out: Optional[str] = None
+
+
+@dataclass
+class Manifest:
+    targets: list[Target]
+    mibs_paths: list[str] = field(default_factory=list)
+    mibs_dirs: list[str] = field(default_factory=list)
+    fast_load: Union[bool, str, None] = FAST_LOAD
+    cache_dir: Optional[str] = None
+    out_dir: str = '.'
+    base_smi: bool = False
+    emit_base: bool = True
+
+    @classmethod
+    def load(cls, path) -> Manifest:
+        """ manifest of json file. raise ValueError if the manifest or a target has unknown or missing fields (or it
+        isn't json) and OSError if the file can't be read """
+        with open(path) as f:
+            data = json.load(f)
+        check_fields(cls, data, 'manifest')
+        for i, target in enumerate(data['targets']):
+            check_fields(Target, target, f'target {i}')
+        data['targets'] = [Target(**target) for target in data['targets']]
+        return cls(**data)
+
+    def target_paths(self, target: Target) -> tuple[str, ...]:
+        """ corpus paths of target """
+        return tuple(self.mibs_paths if target.mibs_paths is None else target.mibs_paths)
+
+    def output(self, target: Target) -> str:
+        return target.out or os.path.join(self.out_dir, f'{target.name}.my')
+
+
+@dataclass
+class TargetResult:
+    name: str
+    out: str
+    seconds: float
+    # number of written definitions
+    definitions: int
+    # number of requested identifiers reused from the previous build
+    reused: int = 0
+    # true if the output is the same as a clean build (only when verifying)
+    verified: Optional[bool] = None
+    # why the target couldn't be built (like an identifier which is not found), nothing is written then
+    error: Optional[str] = None
+
+
+def build_target(manifest: Manifest, target: Target, corpora: dict[tuple[str, ...], MibCorpus],
+                 state_dir: str = None, verify: bool = False) -> TargetResult:
+    """
+    build target and write its output. if an identifier of the target is not found or a file can't be read, the
+    error is recorded in the result and nothing is written.
+    :param corpora: {corpus paths:MibCorpus} already made corpora to build from. the corpus mibs are loaded by the
+    first build which needs them
+    :param state_dir: directory of build manifests for incremental building
+    :param verify: compare the output with a clean build
+    """
+    start = time.perf_counter()
+    paths = list(manifest.target_paths(target))
+    corpus = corpora.get(tuple(paths))
+    if corpus is None:
+        fast_load = manifest.fast_load
+        if fast_load is None:
+            fast_load = MibCorpus.choose_algorithm([file for path in paths for file in glob(path)],
+                                                   len(target.idrs_list))
+        corpus = corpora[tuple(paths)] = MibCorpus(fast_load=fast_load, cache_dir=manifest.cache_dir,
+                                                   mibs_dirs=manifest.mibs_dirs, base_smi=manifest.base_smi)
+    build_manifest = None
+    if state_dir:
+        os.makedirs(state_dir, exist_ok=True)
+        build_manifest = os.path.join(state_dir, f'{target.name}.build.json')
+    out = manifest.output(target)
+    try:
+        mibParser = MibParser(target.name, idrs_dict=target.idrs_dict, idrs_list=target.idrs_list, mibs_paths=paths,
+                              corpus=corpus, build_manifest=build_manifest, emit_base=manifest.emit_base)
+        missing = [(idrName, path) for idrName, path in target.idrs_dict.items() if idrName not in mibParser]
+        if missing:
+            raise ValueError(f'identifier {missing[0][0]} not found in {missing[0][1]}')
+    except (ValueError, OSError) as e:
+        logger.error(f'{target.name}: {e}')
+        return TargetResult(target.name, out, time.perf_counter() - start, 0, error=str(e))
+    os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+    mibParser.write_mib(out)
+    definitions = sum(1 for idr in mibParser.parsed_identifiers.values()
+                      if idr and (manifest.emit_base or not idr.module.base))
+    result = TargetResult(target.name, out, time.perf_counter() - start, definitions, mibParser.reused)
+    if verify:
+        clean = MibParser(target.name, idrs_dict=target.idrs_dict, idrs_list=target.idrs_list, mibs_paths=paths,
+                          fast_load=corpus.fast_load, mibs_dirs=manifest.mibs_dirs, base_smi=manifest.base_smi,
+                          emit_base=manifest.emit_base)
+        with open(out) as f:
+            result.verified = f.read() == clean.eject_mib()
+    return result
+
+
+# state of a worker process: the manifest, build_target options and the corpora loaded by the worker
+_manifest: Optional[Manifest] = None
+_options: dict = {}
+_corpora: dict[tuple[str, ...], MibCorpus] = {}
+
+
+def _init_worker(manifest: Manifest, options: dict, level: int):
+    global _manifest
+    logging.basicConfig(level=level, format='%(message)s')
+    _manifest = manifest
+    _options.update(options)
+    _corpora.clear()
+
+
+def _build_in_worker(target: Target) -> TargetResult:
+    return build_target(_manifest, target, _corpora, **_options)
+
+
+def index_corpus(manifest: Manifest):
+    """ load and index all the corpus files of the manifest targets once into its cache_dir """
+    paths = dict.fromkeys(path for target in manifest.targets for path in manifest.target_paths(target))
+    files = [file for path in paths for file in glob(path)]
+    logger.info(f'indexing {len(files)} mib files')
+    MibCorpus(list(paths), fast_load=FAST_LOAD, cache_dir=manifest.cache_dir).close()
+
+
+def build(manifest: Manifest, jobs: int = 1, state_dir: str = None, verify: bool = False) -> list[TargetResult]:
+    """ build all the targets of the manifest by jobs worker processes. results in targets order.
+    see build_target for state_dir and verify """
+    options = {'state_dir': state_dir, 'verify': verify}
+    if jobs <= 1 or len(manifest.targets) <= 1:
+        corpora: dict[tuple[str, ...], MibCorpus] = {}
+        try:
+            return [build_target(manifest, target, corpora, **options) for target in manifest.targets]
+        finally:
+            for corpus in corpora.values():
+                corpus.close()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        if not manifest.cache_dir:
+            manifest = replace(manifest, cache_dir=cache_dir)
+        index_corpus(manifest)
+        with ProcessPoolExecutor(jobs, initializer=_init_worker,
+                                 initargs=(manifest, options,
+                                           logging.getLogger('MibParser').getEffectiveLevel())) as executor:
+            return list(executor.map(_build_in_worker, manifest.targets))
+
+
+def report(results: list[TargetResult], seconds: float):
+    for result in results:
+        if result.error:
+            print(f'{result.name:40} FAILED: {result.error}')
+            continue
+        verified = {None: '', True: '  verified', False: '  DIFFERENT FROM CLEAN BUILD'}[result.verified]
+        print(f'{result.name:40} {result.seconds * 1e3:10.2f} ms {result.definitions:8} definitions '
+              f'{result.reused:6} reused  {result.out}{verified}')
+    print(f'built {len(results)} modules in {seconds:.3f}s')
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m MibParser')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build_parser = commands.add_parser('build', help='build the modules of a manifest')
+    build_parser.add_argument('manifest', help='manifest json file')
+    build_parser.add_argument('--jobs', type=int, default=1, help='number of worker processes')
+    build_parser.add_argument('--report', help='json file of per target timing')
+    build_parser.add_argument('--state-dir', help='directory of build records for incremental rebuilding')
+    build_parser.add_argument('--verify', action='store_true', help='check every output against a clean build')
+    build_parser.add_argument('-v', '--verbose', action='store_true', help='log building progress')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format='%(message)s')
+    try:
+        manifest = Manifest.load(args.manifest)
+    except (ValueError, OSError) as e:
+        build_parser.error(f'{args.manifest}: {e}')
+    start = time.perf_counter()
+    results = build(manifest, args.jobs, args.state_dir, args.verify)
+    seconds = time.perf_counter() - start
+    report(results, seconds)
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({'seconds': seconds, 'targets': [asdict(result) for result in results]}, f, indent=2)
+    failed = [result.name for result in results if result.error]
+    if failed:
+        print(f'{len(failed)} modules failed: {", ".join(failed)}')
+    different = [result.name for result in results if result.verified is False]
+    if different:
+        print(f'{len(different)} modules are different from a clean build: {", ".join(different)}')
+    return 1 if failed or different else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import warnings
+from glob import glob
+from typing import TYPE_CHECKING, Callable, Optional, Iterable, Union
+
+if TYPE_CHECKING:
+    from MibParser import MibParser, MibIdr, MibModule, pathType
+
+logger = logging.getLogger('MibParser')
+
+# child of a definition which can't be resolved (resolving it does nothing) or which resolves to a definition that is
+# not part of the build (its name was already taken by another definition)
+_UNRESOLVED = None
+_MISSING = -1
+
+
+def corpus_signature(mibs_paths: Iterable[pathType]) -> list[list]:
+    """ [path, mtime, size] of loaded mib files in loading order """
+    signature = []
+    for file in dict.fromkeys(file for reg in mibs_paths for file in glob(reg)):
+        st = os.stat(file)
+        signature.append([file, st.st_mtime, st.st_size])
+    return signature
+
+
+class BuildManifest:
+    """
+    record of a build for rebuilding it incrementally (see MibParser build_manifest).
+
+    holds the graph of the built definitions: (file, name) of each definition and its dependencies resolved in the
+    context of its module. each requested identifier is recorded with the definition it resolved to, and the content
+    hashes of the files its dependency closure touched (definitions files and imported modules on the way).
+
+    a later build walks the graph of requests whose files are unchanged exactly like resolving does (depth first,
+    skipping names already built), so only added or changed requests are resolved and the output is the same as a
+    clean build.
+    """
+
+    version = 1
+
+    def __init__(self):
+        # [(path, name, [child index, _UNRESOLVED or _MISSING])] built definitions in resolving order
+        self.definitions: list[tuple[str, str, list[Optional[int]]]] = []
+        # [{'name', 'path' (None if searched in loaded mibs), 'root' (definition index or None), 'files'}]
+        self.requests: list[dict] = []
+        # {path:content hash} of files used by the requests
+        self.files: dict[str, str] = {}
+        # algorithm and corpus_signature of loaded mibs the searched identifiers were found in
+        self.algorithm: Union[bool, str, None] = None
+        self.corpus: list[list] = []
+
+    @classmethod
+    def load(cls, path: pathType) -> Optional[BuildManifest]:
+        """ manifest saved in path. None if there is no manifest or it was saved by another version """
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != cls.version:
+            return None
+        manifest = cls()
+        manifest.definitions = [tuple(definition) for definition in data['definitions']]
+        manifest.requests = data['requests']
+        manifest.files = data['files']
+        manifest.algorithm = data['algorithm']
+        manifest.corpus = data['corpus']
+        return manifest
+
+    def save(self, path: pathType):
+        with open(path, 'w') as f:
+            json.dump({'version': self.version, 'algorithm': self.algorithm, 'corpus': self.corpus,
+                       'files': self.files, 'requests': self.requests, 'definitions': self.definitions}, f)
+
+    def request(self, idrName: str, path: Optional[str]) -> Optional[dict]:
+        return next((request for request in self.requests
+                     if request['name'] == idrName and request['path'] == path), None)
+
+    def is_reusable(self, request: dict, content_hash: Callable[[str], str],
+                    signature: Callable[[], list[list]], algorithm) -> bool:
+        """
+        true if request resolves to the same definitions: all the files it touched are unchanged and, for searched
+        identifiers, the loaded mibs are the same.
+        :param content_hash: current content hash of file
+        :param signature: current corpus_signature of loaded mibs
+        """
+        if request['root'] is None:
+            return False
+        if request['path'] is None and (algorithm != self.algorithm or signature() != self.corpus):
+            return False
+        return all(content_hash(path) == self.files.get(path) for path in request['files'])
+
+    def walk(self, root: int, built: Callable[[str], bool]) -> Iterable[tuple[str, str]]:
+        """ yield (path, idrName) of definitions built by resolving root: depth first, skipping built names.
+        :param built: true if idrName is built, including the names yielded before """
+        stack = [root]
+        while stack:
+            path, idrName, children = self.definitions[stack.pop()]
+            if built(idrName):
+                continue
+            yield path, idrName
+            stack.extend(child for child in reversed(children) if child is not None and child >= 0)
+
+    def _closure_files(self, root: int, vias: list[set[str]]) -> Optional[set[str]]:
+        """ files of all definitions reachable from root and of imported modules on the way. None if it reaches a
+        definition which is not in the build """
+        files = set()
+        seen = {root}
+        stack = [root]
+        while stack:
+            i = stack.pop()
+            path, idrName, children = self.definitions[i]
+            files.add(path)
+            files.update(vias[i])
+            for child in children:
+                if child == _MISSING:
+                    return None
+                if child is not None and child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        return files
+
+    @classmethod
+    def record(cls, mibParser: MibParser, idrs_dict: dict[str, str], idrs_list: list[str],
+               mibs_paths: list[pathType]) -> BuildManifest:
+        """ manifest of mibParser build of requested identifiers """
+        manifest = cls()
+        corpus = mibParser.corpus
+        manifest.algorithm = corpus.fast_load
+        manifest.corpus = corpus_signature(mibs_paths) if idrs_list else []
+
+        built = [(name, idr) for name, idr in mibParser.parsed_identifiers.items() if idr]
+        indexes: dict[MibIdr, int] = {idr: i for i, (name, idr) in enumerate(built)}
+
+        def locate(module: MibModule, idrName: str, _IdrClass=None) -> tuple[Optional[int], set[str]]:
+            idr, visited = module.locate_definition(idrName, _IdrClass)
+            via = {str(importedModule.path) for importedModule in visited}
+            if idr is None:
+                return _UNRESOLVED, via
+            return indexes.get(idr, _MISSING), via
+
+        # {definition index:files of imported modules its dependencies are resolved through}
+        vias: list[set[str]] = []
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            for name, idr in built:
+                children = []
+                via = set()
+                for depName, _DepClass in idr.requires:
+                    child, depVia = locate(idr.module, depName, _DepClass)
+                    children.append(child)
+                    via |= depVia
+                manifest.definitions.append((str(idr.module.path), name, children))
+                vias.append(via)
+
+            # replay the build on the graph: finds the roots of the searched identifiers and checks the graph
+            names = {name for name, idr in mibParser.parsed_identifiers.items() if not idr}
+            order = []
+
+            def replay(root: Optional[int]):
+                if root is not None and root >= 0:
+                    for path, idrName in manifest.walk(root, names.__contains__):
+                        names.add(idrName)
+                        order.append(idrName)
+
+            for name, path in idrs_dict.items():
+                module = mibParser.modules.get(path) or corpus.get_module(path)
+                root, via = locate(module, name)
+                via.add(str(module.path))
+                manifest.requests.append({'name': name, 'path': path, 'root': root, 'via': via})
+                if name not in names:
+                    replay(root)
+            for name in idrs_list:
+                # identifiers already built are not searched, so their definition is known only if built now
+                root = indexes[mibParser.parsed_identifiers[name]] \
+                    if name not in names and mibParser.parsed_identifiers.get(name) else None
+                manifest.requests.append({'name': name, 'path': None, 'root': root, 'via': set()})
+                replay(root)
+
+        if order != [name for name, idr in built]:
+            logger.warning('build manifest does not reproduce the build and will not be reused')
+            for request in manifest.requests:
+                request['root'] = None
+
+        for request in manifest.requests:
+            via = request.pop('via')
+            files = manifest._closure_files(request['root'], vias) if request['root'] not in (None, _MISSING) \
+                else None
+            if files is None:
+                request['root'] = None
+            request['files'] = sorted(files | via) if files is not None else []
+            for path in request['files']:
+                if path not in manifest.files:
+                    manifest.files[path] = corpus.content_hash(path)
+        return manifest
@@ -0,0 +1,96 @@
+"""
+streaming export of every definition of mib files to JSON Lines, a record per line (see MibModule.iter_definitions).
+
+    python -m MibExport 'mibs/*.my' [more paths...] [--out definitions.jsonl] [--jobs N] [--verbose]
+
+files are exported in a deterministic order: paths in the given order, the files of each path sorted and each file
+once. the records of each file are in definition order, so the output is the same for any number of jobs.
+
+files are parsed one at a time and not kept, so memory is bounded by the largest file (times the files parsed ahead
+by worker processes) and not by the corpus.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from glob import glob
+from typing import Iterable, Iterator, TextIO, Union
+
+from MibParser import MibCorpus, MibModule, prefetch, read_file, pathType
+
+logger = logging.getLogger('MibParser.export')
+
+# corpus of the exported modules. modules are not registered in it, so they are released after export
+_corpus: MibCorpus = None
+
+
+def mib_files(mibs_paths: Iterable[pathType]) -> list[str]:
+    """ files of mibs_paths globs in export order """
+    return list(dict.fromkeys(file for reg in mibs_paths for file in sorted(glob(reg))))
+
+
+def file_records(path: str) -> list[dict]:
+    """ records of the definitions of mib file. files which are not mib modules have no records """
+    global _corpus
+    if _corpus is None:
+        _corpus = MibCorpus()
+    try:
+        module = MibModule(_corpus, path, text=read_file(path))
+    except Exception as e:
+        logger.warning(f'skipping {path}: {e}')
+        return []
+    return list(module.iter_definitions())
+
+
+def iter_records(mibs_paths: Iterable[pathType], jobs: int = 1) -> Iterator[dict]:
+    """
+    yield the records of all the definitions of mibs_paths in export order.
+    :param jobs: number of worker processes parsing files ahead of the consumer
+    """
+    files = mib_files(mibs_paths)
+    logger.info(f'exporting {len(files)} mib files')
+    if jobs <= 1:
+        for path in files:
+            yield from file_records(path)
+        return
+    with ProcessPoolExecutor(jobs) as executor:
+        for path, records in prefetch(file_records, files, executor, 2 * jobs):
+            yield from records
+
+
+def export(mibs_paths: Union[list[pathType], pathType], dest: Union[pathType, TextIO], jobs: int = 1) -> int:
+    """
+    write the records of all the definitions of mibs_paths as JSON Lines into dest (path or writable text file).
+    return number of written records
+    """
+    if type(mibs_paths) != list:
+        mibs_paths = [mibs_paths]
+    if not hasattr(dest, 'write'):
+        with open(dest, 'w') as f:
+            return export(mibs_paths, f, jobs)
+    count = 0
+    for record in iter_records(mibs_paths, jobs):
+        dest.write(json.dumps(record) + '\n')
+        count += 1
+    return count
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m MibExport')
+    parser.add_argument('mibs_paths', nargs='+', help='mib files or globs')
+    parser.add_argument('--out', help='JSON Lines file (default standard output)')
+    parser.add_argument('--jobs', type=int, default=1, help='number of worker processes')
+    parser.add_argument('-v', '--verbose', action='store_true', help='log exporting progress')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format='%(message)s')
+    count = export(args.mibs_paths, args.out or sys.stdout, args.jobs)
+    logger.info(f'exported {count} definitions')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
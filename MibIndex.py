@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+from MibLexer import MibScan
+
+
+def file_hash(text: str) -> str:
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+class MibIndex:
+    """
+    persistent on-disk index of mib files (sqlite database in a cache directory).
+
+    maps identifier name to (file path, offset of definition, 'oid' or 'type') so searching an identifier does not
+    require scanning all loaded mib files. each file entry is invalidated by its mtime/size and content hash.
+
+    also caches the scan (MibScan) of each file content by content hash, so modules are not scanned again.
+
+    may be used by many threads, accesses to the database are serialized.
+    """
+
+    version = 4
+    filename = 'mib-index.sqlite3'
+
+    def __init__(self, cache_dir):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = Path(cache_dir) / self.filename
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.executescript(f'''
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY, mtime REAL, size INTEGER, hash TEXT, version INTEGER);
+            CREATE TABLE IF NOT EXISTS identifiers (
+                name TEXT, path TEXT, offset INTEGER, kind TEXT);
+            CREATE INDEX IF NOT EXISTS identifiers_name ON identifiers (name);
+            CREATE INDEX IF NOT EXISTS identifiers_path ON identifiers (path);
+            CREATE TABLE IF NOT EXISTS scans (
+                hash TEXT PRIMARY KEY, version INTEGER, data BLOB);
+            DELETE FROM identifiers WHERE path IN (SELECT path FROM files WHERE version != {self.version});
+            DELETE FROM files WHERE version != {self.version};
+            DELETE FROM scans WHERE version != {self.version};
+        ''')
+
+    @staticmethod
+    def _key(path) -> str:
+        return os.path.realpath(path)
+
+    @staticmethod
+    def extract_definitions(scan: MibScan):
+        """ yield (name, offset, kind) of every definition in mib scan """
+        for name, (start, end, kind) in scan.defined_idrs.items():
+            yield name, start, kind
+
+    def fresh_hash(self, path) -> Optional[str]:
+        """ content hash of file if its index entry is up to date by file stat (without reading the file) """
+        with self._lock:
+            row = self._db.execute('SELECT mtime, size, hash FROM files WHERE path = ?', (self._key(path),)).fetchone()
+        if not row:
+            return None
+        st = os.stat(path)
+        return row[2] if row[:2] == (st.st_mtime, st.st_size) else None
+
+    def is_fresh(self, path) -> bool:
+        """ true if file index entry is up to date by file stat (without reading the file) """
+        return self.fresh_hash(path) is not None
+
+    def scan(self, h: str) -> Optional[MibScan]:
+        """ cached scan of file content by its hash """
+        with self._lock:
+            row = self._db.execute('SELECT data FROM scans WHERE hash = ?', (h,)).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def update(self, path, text: str, scan: MibScan = None, h: str = None):
+        """
+        index file text unless the indexed content hash is the same.
+        :param scan: already made scan of text. if not given text is scanned only if it is not indexed or cached
+        :param h: already calculated content hash of text
+        """
+        key = self._key(path)
+        st = os.stat(path)
+        h = h or file_hash(text)
+        with self._lock:
+            row = self._db.execute('SELECT hash FROM files WHERE path = ?', (key,)).fetchone()
+        if (not row or row[0] != h) and not scan:
+            scan = self.scan(h) or MibScan(text)
+        with self._lock, self._db:
+            if not row or row[0] != h:
+                self._db.execute('DELETE FROM identifiers WHERE path = ?', (key,))
+                self._db.executemany('INSERT INTO identifiers VALUES (?, ?, ?, ?)',
+                                     ((name, key, offset, kind) for name, offset, kind in
+                                      self.extract_definitions(scan)))
+            if scan:
+                self._db.execute('INSERT OR IGNORE INTO scans VALUES (?, ?, ?)',
+                                 (h, self.version, pickle.dumps(scan, pickle.HIGHEST_PROTOCOL)))
+            self._db.execute('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)',
+                             (key, st.st_mtime, st.st_size, h, self.version))
+
+    def lookup(self, idrName: str) -> list[tuple[str, int, str]]:
+        """ return list of (path, offset, kind) of all indexed definitions of idrName """
+        with self._lock:
+            return self._db.execute('SELECT path, offset, kind FROM identifiers WHERE name = ?', (idrName,)).fetchall()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+import re
+from typing import Iterable, NamedTuple, Optional
+
+# token kinds
+STRING = 'string'
+COMMENT = 'comment'
+ASSIGN = 'assign'
+WORD = 'word'
+PUNCT = 'punct'
+
+_r_token = re.compile(r'(?P<string>"[^"]*")|(?P<comment>--[^\n]*)|(?P<assign>::=)|(?P<word>\w+(?:-\w+)*)'
+                      r'|(?P<punct>[^\s\w"])')
+_r_comment_or_string = re.compile(r'"[^"]*"|--[^\n]*')
+
+# macros which defines value: 'name MACRO-NAME ... ::= value'
+oid_macros = ("OBJECT-TYPE", "OBJECT-IDENTITY", "MODULE-IDENTITY", "NOTIFICATION-TYPE", "OBJECT-GROUP",
+              "NOTIFICATION-GROUP", "MODULE-COMPLIANCE", "AGENT-CAPABILITIES")
+_macros = frozenset(oid_macros + ("TRAP-TYPE",))
+
+# kinds of definitions
+OID = 'oid'
+TYPE = 'type'
+_MACRO = 'macro'
+
+_open_brackets = {'{': '}', '(': ')', '[': ']'}
+_close_brackets = frozenset(_open_brackets.values())
+
+
+class Token(NamedTuple):
+    kind: str
+    value: str
+    start: int
+    end: int
+
+
+def tokenize(text: str, pos: int = 0, endpos: int = None) -> list[Token]:
+    """ split text into tokens (without comments). one pass, strings are kept as one token """
+    if endpos is None:
+        endpos = len(text)
+    return [Token(m.lastgroup, m.group(), m.start(), m.end()) for m in _r_token.finditer(text, pos, endpos)
+            if m.lastgroup != COMMENT]
+
+
+def strip_comments(text: str) -> str:
+    """ remove '--' comments (until end of line) from text. comment signs inside strings are kept """
+    if '--' not in text:
+        return text
+    pieces = []
+    i = 0
+    for m in _r_comment_or_string.finditer(text):
+        if m.group()[0] == '-':
+            pieces.append(text[i:m.start()])
+            i = m.end()
+    pieces.append(text[i:])
+    return ''.join(pieces)
+
+
+def find_token(toks: list[Token], value: str, i: int = 0, endi: int = None) -> Optional[int]:
+    """ index of first token with given value from toks[i] """
+    for j in range(i, len(toks) if endi is None else endi):
+        if toks[j].value == value:
+            return j
+    return None
+
+
+def match_bracket(toks: list[Token], i: int) -> Optional[int]:
+    """ index of the bracket closing the bracket at toks[i] """
+    depth = 0
+    for j in range(i, len(toks)):
+        v = toks[j].value
+        if v in _open_brackets:
+            depth += 1
+        elif v in _close_brackets:
+            depth -= 1
+            if not depth:
+                return j
+    return None
+
+
+def split_tokens(toks: list[Token], sep: str = ',') -> list[list[Token]]:
+    """ split tokens by separator which is outside any brackets """
+    parts, part, depth = [], [], 0
+    for t in toks:
+        if not depth and t.value == sep:
+            parts.append(part)
+            part = []
+            continue
+        if t.value in _open_brackets:
+            depth += 1
+        elif t.value in _close_brackets:
+            depth -= 1
+        part.append(t)
+    parts.append(part)
+    return parts
+
+
+def clause(toks: list[Token], keyword: str, end_keywords: Iterable[str]) -> Optional[list[Token]]:
+    """ tokens between keyword and first of end_keywords which follows it """
+    i = find_token(toks, keyword)
+    if i is None:
+        return None
+    for j in range(i + 1, len(toks)):
+        if toks[j].value in end_keywords:
+            return toks[i + 1:j]
+    return None
+
+
+def clause_spans(toks: list[Token], keywords: Iterable[str], end: str = '::=') -> dict[str, tuple[int, int]]:
+    """ {keyword:(start, end)} text span of the value of each clause. clauses start by one of keywords outside any
+    brackets and the last one ends at end token (or at the last token). first clause of each keyword is kept """
+    spans = {}
+    keyword = first = last = None
+    depth = 0
+    for t in toks:
+        if not depth and (t.value in keywords or t.value == end):
+            if keyword and first is not None:
+                spans.setdefault(keyword, (first.start, last.end))
+            if t.value == end:
+                break
+            keyword, first = t.value, None
+            continue
+        if t.value in _open_brackets:
+            depth += 1
+        elif t.value in _close_brackets:
+            depth -= 1
+        if first is None:
+            first = t
+        last = t
+    if keyword and first is not None:
+        spans.setdefault(keyword, (first.start, last.end))
+    return spans
+
+
+def words(toks: list[Token], ignore: Iterable[str] = ()) -> list[str]:
+    """ words outside any brackets """
+    depth = 0
+    ws = []
+    for t in toks:
+        if t.value in _open_brackets:
+            depth += 1
+        elif t.value in _close_brackets:
+            depth -= 1
+        elif not depth and t.kind == WORD and t.value not in ignore:
+            ws.append(t.value)
+    return ws
+
+
+def _value(toks: list[Token], i: int) -> Optional[str]:
+    return toks[i].value if i < len(toks) else None
+
+
+def oid_components(toks: list[Token]) -> tuple[tuple[Optional[str], Optional[int]], ...]:
+    """ (name, number) components of object identifier value tokens: 'iso org(3) dod(6) 1' ->
+    (('iso', None), ('org', 3), ('dod', 6), (None, 1)) """
+    components = []
+    i = 0
+    while i < len(toks):
+        t = toks[i]
+        if t.kind == WORD and t.value.isdigit():
+            components.append((None, int(t.value)))
+        elif t.kind == WORD:
+            if _value(toks, i + 1) == '(' and (_value(toks, i + 2) or '').isdigit() and _value(toks, i + 3) == ')':
+                components.append((t.value, int(toks[i + 2].value)))
+                i += 4
+                continue
+            components.append((t.value, None))
+        i += 1
+    return tuple(components)
+
+
+def definition_head(toks: list[Token], i: int) -> Optional[str]:
+    """ kind of definition that starts at toks[i] or None if toks[i] is not a definition head """
+    if toks[i].kind != WORD:
+        return None
+    nxt = _value(toks, i + 1)
+    if nxt == '::=':
+        return TYPE
+    if nxt == 'MACRO':
+        return _MACRO
+    if nxt in _macros or nxt == 'OBJECT' and _value(toks, i + 2) == 'IDENTIFIER' and _value(toks, i + 3) == '::=':
+        return OID
+    return None
+
+
+def module_header(toks: list[Token]) -> Optional[tuple[int, int]]:
+    """ indexes of the name and of 'BEGIN' tokens of module header 'name DEFINITIONS ::= BEGIN' """
+    i = next((i for i, t in enumerate(toks) if t.value == 'DEFINITIONS' and i and toks[i - 1].kind == WORD), None)
+    b = find_token(toks, 'BEGIN', i) if i is not None else None
+    return (i - 1, b) if b is not None else None
+
+
+class MibScan:
+    """
+    single pass scan of a module text.
+    holds the module name, imports and definition table of {idrName:(start, end, kind)} spans.
+    spans refer to the original (not comment-stripped) text.
+    """
+
+    def __init__(self, text: str):
+        self.name: Optional[str] = None
+        # {regionName:(start, end)} of 'START', 'EXPORTS', 'IMPORTS' and 'DEFS' regions
+        self.regions: dict[str, tuple[int, int]] = {}
+        # {idrName:moduleName which defines idrName}
+        self.imported_idrs: dict[str, str] = {}
+        # {idrName:(start, end, kind)}
+        self.defined_idrs: dict[str, tuple[int, int, str]] = {}
+        # {oidName:((name, number), ...)} components of object identifier values (see oid_components)
+        self.oid_values: dict[str, tuple[tuple[Optional[str], Optional[int]], ...]] = {}
+        # {oidName:[names of object identifiers defined directly under oidName]} in definition order
+        self.children: dict[str, list[str]] = {}
+
+        self._scan(tokenize(text))
+
+    @classmethod
+    def from_tables(cls, tables: dict) -> MibScan:
+        """ scan made from already computed tables (see tables) """
+        scan = cls.__new__(cls)
+        scan.name = tables['name']
+        scan.regions = dict(tables['regions'])
+        scan.imported_idrs = dict(tables['imported_idrs'])
+        scan.defined_idrs = dict(tables['defined_idrs'])
+        scan.oid_values = dict(tables['oid_values'])
+        scan.children = {name: list(children) for name, children in tables['children'].items()}
+        return scan
+
+    def tables(self) -> dict:
+        return {'name': self.name, 'regions': self.regions, 'imported_idrs': self.imported_idrs,
+                'defined_idrs': self.defined_idrs, 'oid_values': self.oid_values, 'children': self.children}
+
+    def _scan(self, toks: list[Token]):
+        # module header: 'name DEFINITIONS ::= BEGIN'
+        header = module_header(toks)
+        if header is None:
+            return
+        n, b = header
+        self.name = toks[n].value
+        self.regions['START'] = (toks[n].start, toks[b].end)
+        i = b + 1
+        for regionName in ('EXPORTS', 'IMPORTS'):
+            e = find_token(toks, ';', i) if _value(toks, i) == regionName else None
+            if e is None:
+                continue
+            self.regions[regionName] = (toks[i].start, toks[e].end)
+            if regionName == 'IMPORTS':
+                self._scan_imports(toks, i + 1, e)
+            i = e + 1
+
+        defs_start = toks[i - 1].end
+        while i < len(toks):
+            t = toks[i]
+            if t.value == 'END':
+                self.regions['DEFS'] = (defs_start, t.end)
+                return
+            head = definition_head(toks, i)
+            if head == TYPE:
+                # type definition ends where next definition starts
+                j = i + 2
+                while j < len(toks) and toks[j].value != 'END' and not definition_head(toks, j):
+                    j += 1
+                self.defined_idrs.setdefault(t.value, (t.start, toks[j - 1].end, TYPE))
+                i = j
+            elif head == _MACRO:
+                i = (find_token(toks, 'END', i + 2) or len(toks)) + 1
+            elif head == OID:
+                a = find_token(toks, '::=', i + 1)
+                if a is None:
+                    return
+                e = match_bracket(toks, a + 1) if _value(toks, a + 1) == '{' else None
+                if e is None:
+                    # not an object identifier value (like 'TRAP-TYPE ... ::= 1')
+                    i = a + 1
+                    continue
+                if t.value not in self.defined_idrs:
+                    self.defined_idrs[t.value] = (t.start, toks[e].end, OID)
+                    components = self.oid_values[t.value] = oid_components(toks[a + 2:e])
+                    if components and components[0][0]:
+                        self.children.setdefault(components[0][0], []).append(t.value)
+                i = e + 1
+            else:
+                i += 1
+
+    def _scan_imports(self, toks: list[Token], i: int, endi: int):
+        """ 'idr1, idr2 FROM module1 idr3 FROM module2' """
+        idrs = []
+        while i < endi:
+            t = toks[i]
+            if t.value == 'FROM' and i + 1 < endi:
+                for idr in idrs:
+                    self.imported_idrs[idr] = toks[i + 1].value
+                idrs = []
+                i += 2
+                continue
+            if t.kind == WORD:
+                idrs.append(t.value)
+            i += 1
+
+
+def scan_file(path) -> MibScan:
+    """ scan of mib file (picklable result for worker processes) """
+    with open(path) as f:
+        return MibScan(f.read())
+
+
+class _HeadsPatterns:
+    """ patterns for searching definition heads in str or bytes text """
+
+    def __init__(self, binary: bool):
+        encode = str.encode if binary else str
+        # literal ends of heads: '::=' and second part of macro names ('-TYPE', '-IDENTITY'...)
+        self.assign = re.compile(encode(r'::='))
+        self.macro_end = re.compile(encode('-(?:' + '|'.join({m.split('-')[1] for m in oid_macros}) + r')\b'))
+        # reversed text before the literal ends
+        self.before_assign = re.compile(encode(r'(?:\s*REIFITNEDI\s+TCEJBO\s*|\s+)([\w-]+)'))
+        self.before_macro_end = re.compile(encode(r'(\w+)\s*([\w-]+)'))
+        self.macros = {encode(m) for m in oid_macros}
+        self.decode = bytes.decode if binary else str
+
+
+_heads_patterns = {str: _HeadsPatterns(False), bytes: _HeadsPatterns(True)}
+_max_head = 256
+
+
+def definition_heads(text) -> set[str]:
+    """
+    names of all definition heads in text (str or bytes-like): 'name OBJECT-TYPE', 'name OBJECT IDENTIFIER ::=',
+    'Name ::='... (comments and strings are not skipped)
+
+    only literal head ends are searched in the text, the name is matched backwards from each of them
+    """
+    p = _heads_patterns[str if isinstance(text, str) else bytes]
+    names = set()
+    for m in p.assign.finditer(text):
+        n = p.before_assign.match(text[max(0, m.start() - _max_head):m.start()][::-1])
+        if n:
+            names.add(p.decode(n.group(1)[::-1]))
+    for m in p.macro_end.finditer(text):
+        n = p.before_macro_end.match(text[max(0, m.start() - _max_head):m.start()][::-1])
+        if n and n.group(1)[::-1] + m.group() in p.macros:
+            names.add(p.decode(n.group(2)[::-1]))
+    return names
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from MibLexer import tokenize, module_header
+
+pathType = Union[str, Path]
+
+# size of the first read of a file when searching its module header
+_header_size = 4096
+
+
+def read_module_name(path: pathType) -> Optional[str]:
+    """ name of the module defined in mib file from its header ('name DEFINITIONS ::= BEGIN'). reads only the start
+    of the file unless the header is not found there """
+    with open(path, errors='replace') as f:
+        text = f.read(_header_size)
+        toks = tokenize(text)
+        header = module_header(toks)
+        if header is None and len(text) == _header_size:
+            toks = tokenize(text + f.read())
+            header = module_header(toks)
+    return toks[header[0]].value if header else None
+
+
+class MibLocator:
+    """
+    finds the file of a module by the module name in search directories (like MIBDIRS).
+
+    each directory is listed once. a module is found by its file name first ('<moduleName>.<extension>') and
+    otherwise by the module names read from the headers of all the files of the directory (read once), so it works
+    for files which are not named by their module. every later lookup is a dict lookup. safe to use from many
+    threads: each directory is listed and its headers are read by one thread while the others wait for it.
+    """
+
+    def __init__(self, directories: Iterable[pathType] = (), extensions: Iterable[str] = ('my', 'mib', 'txt')):
+        """
+        :param directories: search directories in searching order
+        :param extensions: extensions of mib files, other files are ignored
+        """
+        self.directories: list[Path] = []
+        self.extensions = frozenset(extension.lower().lstrip('.') for extension in extensions)
+        # {directory:{file name without extension:path}}
+        self._files: dict[Path, dict[str, str]] = {}
+        # {directory:{moduleName:path}} from the files headers
+        self._modules: dict[Path, dict[str, str]] = {}
+        self._lock = threading.RLock()
+        for directory in directories:
+            self.add_directory(directory)
+
+    def add_directory(self, directory: pathType):
+        directory = Path(directory).resolve()
+        with self._lock:
+            if directory not in self.directories:
+                self.directories = [*self.directories, directory]
+
+    def _list(self, directory: Path) -> dict[str, str]:
+        files = self._files.get(directory)
+        if files is not None:
+            return files
+        with self._lock:
+            if directory in self._files:
+                return self._files[directory]
+            files = {}
+            try:
+                entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+            except OSError:
+                entries = []
+            for entry in entries:
+                stem, dot, extension = entry.name.rpartition('.')
+                if dot and extension.lower() in self.extensions and entry.is_file():
+                    files.setdefault(stem, entry.path)
+            self._files[directory] = files
+            return files
+
+    def _headers(self, directory: Path) -> dict[str, str]:
+        modules = self._modules.get(directory)
+        if modules is not None:
+            return modules
+        with self._lock:
+            if directory in self._modules:
+                return self._modules[directory]
+            modules = {}
+            for path in self._list(directory).values():
+                moduleName = read_module_name(path)
+                if moduleName:
+                    modules.setdefault(moduleName, path)
+            self._modules[directory] = modules
+            return modules
+
+    def find_in(self, directory: pathType, moduleName: str) -> Optional[str]:
+        """ path of the file of moduleName in directory or None if not found """
+        directory = Path(directory).resolve()
+        return self._list(directory).get(moduleName) or self._headers(directory).get(moduleName)
+
+    def find(self, moduleName: str, directory: pathType = None) -> Optional[str]:
+        """ path of the file of moduleName. directory (of the importing module) is searched before the search
+        directories """
+        directories = self.directories if directory is None else [directory, *self.directories]
+        for directory in directories:
+            path = self.find_in(directory, moduleName)
+            if path:
+                return path
+        return None
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from typing import Iterator, Optional, Union
+
+oidType = Union[str, tuple[int, ...], list[int]]
+
+# arcs of the top level names which are not defined by any mib
+root_arcs = {'ccitt': 0, 'iso': 1, 'joint-iso-ccitt': 2}
+
+
+def parse_oid(oid: oidType) -> tuple[int, ...]:
+    """
+    numeric oid as tuple of arcs: '1.3.6.1' or '.1.3.6.1' -> (1, 3, 6, 1).
+    raise ValueError if oid is empty or an arc isn't a number ('', '1..3', '1.3.', 'iso.3')
+    """
+    if isinstance(oid, str):
+        arcs = (oid[1:] if oid.startswith('.') else oid).split('.')
+        if not all(arc.isascii() and arc.isdigit() for arc in arcs):
+            raise ValueError(f'invalid oid {oid!r}')
+        return tuple(map(int, arcs))
+    if not oid:
+        raise ValueError(f'invalid oid {oid!r}')
+    return tuple(oid)
+
+
+def format_oid(oid: tuple[int, ...]) -> str:
+    return '.'.join(map(str, oid))
+
+
+class OidNode:
+    """ node of the oid tree: arc number, name of the object (if known) and children by arc number """
+    __slots__ = ('arc', 'name', 'parent', 'children')
+
+    def __init__(self, arc: Optional[int], parent: Optional[OidNode]):
+        self.arc = arc
+        self.name: Optional[str] = None
+        self.parent = parent
+        self.children: Optional[dict[int, OidNode]] = None
+
+    def child(self, arc: int) -> OidNode:
+        """ child of arc. created if not exist """
+        if self.children is None:
+            self.children = {}
+        node = self.children.get(arc)
+        if node is None:
+            node = self.children[arc] = OidNode(arc, self)
+        return node
+
+    @property
+    def oid(self) -> tuple[int, ...]:
+        arcs = []
+        node = self
+        while node.parent is not None:
+            arcs.append(node.arc)
+            node = node.parent
+        return tuple(reversed(arcs))
+
+    def __iter__(self) -> Iterator[OidNode]:
+        """ named nodes of the subtree in oid order (depth first) """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.name is not None:
+                yield node
+            if node.children:
+                stack.extend(node.children[arc] for arc in sorted(node.children, reverse=True))
+
+    def __repr__(self):
+        return f'OidNode({self.name}, {format_oid(self.oid)})'
+
+
+class OidTree:
+    """
+    numeric object identifiers tree (trie of arcs).
+
+    lookups of name by numeric oid and longest prefix match are O(depth), lookup of numeric oid by name walks up from
+    the node of the name.
+    """
+
+    def __init__(self):
+        self.root = OidNode(None, None)
+        # {name:node}
+        self._names: dict[str, OidNode] = {}
+
+    def add(self, name: str, oid: oidType) -> OidNode:
+        """ add named object. the first name added for a name or for an oid is kept """
+        node = self.root
+        for arc in parse_oid(oid):
+            node = node.child(arc)
+        if node.name is None:
+            node.name = name
+        self._names.setdefault(name, node)
+        return node
+
+    def node(self, oid: oidType) -> Optional[OidNode]:
+        node = self.root
+        for arc in parse_oid(oid):
+            if not node.children or arc not in node.children:
+                return None
+            node = node.children[arc]
+        return node
+
+    def name(self, oid: oidType) -> Optional[str]:
+        """ name of exactly this numeric oid """
+        node = self.node(oid)
+        return node.name if node else None
+
+    def longest_prefix(self, oid: oidType) -> Optional[tuple[str, tuple[int, ...]]]:
+        """ (name, rest of arcs) of the longest named prefix of oid: '1.3.6.1.2.1.1.2.0' -> ('sysObjectID', (0,)) """
+        arcs = parse_oid(oid)
+        node = self.root
+        found = None
+        for i, arc in enumerate(arcs):
+            if not node.children or arc not in node.children:
+                break
+            node = node.children[arc]
+            if node.name is not None:
+                found = (node.name, arcs[i + 1:])
+        return found
+
+    def oid(self, name: str) -> Optional[tuple[int, ...]]:
+        """ numeric oid of name """
+        node = self._names.get(name)
+        return node.oid if node else None
+
+    def __contains__(self, name: str):
+        return name in self._names
+
+    def __len__(self):
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[OidNode]:
+        return iter(self.root)
@@ -1,16 +1,26 @@
 from __future__ import annotations
 
+import logging
+import mmap
 import os
-import re
+import sys
+import threading
+import time
 import warnings
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, Future
 from glob import glob
 from pathlib import Path
-from typing import Union, Iterable, Optional
+from typing import Union, Iterable, Iterator, Optional, TextIO, Callable, Any
 
-from Region import Region
-
-# _rDWord = r'(\w|-)+'  # dashed word
-_rDWord = r'[\w-]+'  # dashed word
+from MibIndex import MibIndex, file_hash
+from MibLocator import MibLocator
+from MibBuildManifest import BuildManifest, corpus_signature
+from MibBaseSmi import base_modules
+from MibOidTree import OidTree, root_arcs
+from MibStats import MibStats
+from MibLexer import MibScan, scan_file, Token, tokenize, strip_comments, find_token, match_bracket, split_tokens, clause, \
+    clause_spans, words, definition_heads, WORD, OID, TYPE
 
 _known_oids = {'iso': None}
 
@@ -20,9 +30,7 @@ _types_def_keywords = ("SEQUENCE", "OF", "SIZE", "FROM")
 
 pathType = Union[str, bytes, os.PathLike]
 
-
-def partition(s, indices):
-    return [s[i:j] for i, j in zip(indices, indices[1:] + [None])]
+logger = logging.getLogger('MibParser')
 
 
 def s_strip(s: str, chars=' \n\t') -> str:
@@ -30,151 +38,229 @@ def s_strip(s: str, chars=' \n\t') -> str:
     return s.strip(chars)
 
 
-def ls_strip(l: list[str], chars=' \n\t') -> list[str]:
-    return [s_strip(s, chars) for s in l]
-
+def read_file(path) -> str:
+    with open(path) as f:
+        return f.read()
 
-def remove_strs(s: str, strs: Iterable[str]):
-    for rm in strs:
-        s = s.replace(rm, '')
-    return s
 
-
-def _remove_type_keywords(s):
-    return remove_strs(s, _types_def_keywords)
+def prefetch(func: Callable[[Any], Any], items: Iterable, executor: Executor = None, window: int = 1) -> Iterator:
+    """
+    yield (item, func(item)) of items in items order.
+    if executor is given func is called by the executor ahead of the consumer for up to window items.
+    """
+    if executor is None:
+        for item in items:
+            yield item, func(item)
+        return
+    pending: deque[tuple[Any, Future]] = deque()
+    for item in items:
+        pending.append((item, executor.submit(func, item)))
+        if len(pending) >= window:
+            item, future = pending.popleft()
+            yield item, future.result()
+    while pending:
+        item, future = pending.popleft()
+        yield item, future.result()
 
 
 class MibIdr:
     """
      identifier. (oid definition or type definition).
-     automatically registers as identifier in mibParser parent in initialization.
+     parsed once and shared by all builds, so it holds nothing of a build. MibParser registers it and resolves its
+     dependencies (see MibParser.dependencies for the definitions they are resolved to in a build).
+
+     only the span of the definition in the module text is kept. the definition text is made when ejected and the
+     clauses (SYNTAX, ACCESS, ...) are parsed on first access.
     """
+    __slots__ = ('name', 'module', 'start', 'end', 'dependencies', 'requires', '_clauses')
 
-    def __init__(self, module: MibModule, text):
-        self.name = re.compile(_rDWord).match(text).group()
+    def __init__(self, module: MibModule, name: str, start: int, end: int):
+        self.name = name
         self.module = module  # parent module
-        self.dependencies: dict[str, MibIdr] = {}
-        self.mibParser = module.mibParser
-        self.text = text
+        # span of the definition in module text
+        self.start = start
+        self.end = end
+        # names of parent oids
+        self.dependencies: tuple[str, ...] = ()
+        # [(idrName, MibIdr class)] dependencies in resolving order
+        self.requires: list[tuple[str, type[MibIdr]]] = []
+        # {clause:text of its value}. parsed on first access
+        self._clauses: Optional[dict[str, str]] = None
+        self._parse(tokenize(self.text))
+
+    @property
+    def text(self) -> str:
+        """ definition text (without comments) """
+        return self.module.definition_text(self.start, self.end)
+
+    @property
+    def clauses(self) -> dict[str, str]:
+        if self._clauses is None:
+            text = self.text
+            self._clauses = self._parse_clauses(text, tokenize(text))
+        return self._clauses
+
+    def _parse(self, toks: list[Token]):
+        """ find the dependencies """
+
+    @staticmethod
+    def _parse_clauses(text: str, toks: list[Token]) -> dict[str, str]:
+        return {}
+
+    def _require(self, idrName: str, _IdrClass: type[MibIdr]):
+        self.requires.append((idrName, _IdrClass))
+
+
+def _first_clause(clauses: dict[str, str], *keywords: str) -> Optional[str]:
+    """ text of the first of keywords clauses, None if there is no such clause """
+    return next((clauses[keyword] for keyword in keywords if keyword in clauses), None)
 
-        self.mibParser[self.name] = self
 
+def _clause_property(*keywords: str) -> property:
+    """ text of the first of keywords clauses, None if the definition has no such clause """
+    def get(self: MibIdr) -> Optional[str]:
+        return _first_clause(self.clauses, *keywords)
+    return property(get)
 
-_type_extensions = ["ENUMERATED", "SEQUENCE", "SET", "CHOICE"]
-_type_plicit = ["EXPLICIT", "IMPLICIT"]
 
-_r_type_extensions = re.compile(f"({r'|'.join(_type_extensions)})" + r'\s*\{(.|\n)*?\}')
-_r_not_type_extensions = re.compile(r'(?<=INTEGER)\s*\{(.|\n)*?\}')
+_type_extensions = ("ENUMERATED", "SEQUENCE", "SET", "CHOICE")
+_type_plicit = ("EXPLICIT", "IMPLICIT")
+
+
+def _type_name(toks: list[Token]) -> str:
+    """ type name from type tokens: remove all the constraint and keywords """
+    return ' '.join(words(toks, _types_def_keywords))
+
+
+def _type_extension(toks: list[Token]) -> Optional[tuple[int, int]]:
+    """ indexes of first and last token of '<extension> { ... }' in type tokens """
+    i = next((i for i, t in enumerate(toks[:-1]) if t.value in _type_extensions and toks[i + 1].value == '{'), None)
+    e = match_bracket(toks, i + 1) if i is not None else None
+    return (i, e) if e is not None else None
+
+
+# keywords which start a clause of TEXTUAL-CONVENTION
+_tc_clauses = frozenset(("DISPLAY-HINT", "STATUS", "DESCRIPTION", "REFERENCE", "SYNTAX"))
 
 
 class MibType(MibIdr):
     """
-    object that holds information about oid-type. immediately parsed.
+    object that holds information about oid-type. dependencies parsed immediately, clauses when accessed.
+    SYNTAX is the SYNTAX clause of textual conventions and the type after '::=' (without tag) of other types.
     """
-    def_reg = r'\s+::=(.|\n)*?(?=(\w|-)+\s*::=|END|(\w|-)+\s*OBJECT-TYPE)'
+    __slots__ = ()
+    kind = TYPE
+
+    EXTENSIONS = _clause_property('EXTENSIONS')
+    TAG = _clause_property('TAG')
+    PLICIT = _clause_property('PLICIT')
+    SYNTAX = _clause_property('SYNTAX')
+    STATUS = _clause_property('STATUS')
 
     @staticmethod
     def get_typeName(text):
         """ remove all the constraint and keywords and leave only type name """
-        clean = s_strip(re.sub(r"\(.*\)", '', _remove_type_keywords(text)))
-        clean = _r_not_type_extensions.sub('', clean)
-        return clean
-
-    def __init__(self, module: MibModule, text):
-        MibIdr.__init__(self, module, text)
+        return _type_name(tokenize(text))
+
+    def _parse(self, toks: list[Token]):
+        extension = _type_extension(toks)
+        if extension:
+            i, e = extension
+            # should include extensions as well: '{ oid type, oid type }'
+            for member in split_tokens(toks[i + 2:e]):
+                typeName = _type_name(member[1:])
+                if typeName:
+                    self._require(member[0].value, MibObjectID)
+                    self._require(typeName, MibType)
 
-        m = _r_type_extensions.search(text)
+    @staticmethod
+    def _parse_clauses(text: str, toks: list[Token]) -> dict[str, str]:
+        clauses = {}
+        extension = _type_extension(toks)
+        if extension:
+            i, e = extension
+            clauses['EXTENSIONS'] = text[toks[i].start:toks[e].end]
+        a = find_token(toks, '::=')
+        b = find_token(toks, '[', a) if a is not None else None
+        e = find_token(toks, ']', b) if b is not None else None
+        if e is not None:
+            clauses['TAG'] = text[toks[b].start:toks[e].end]
+        m = next((t for t in toks if t.value in _type_plicit), None)
         if m:
-            self.EXTENSIONS = m.group()
-            # should include extensions as well:
-            exts = self.EXTENSIONS[re.search(r'\w+', self.EXTENSIONS).end():].strip(' \n\t{}')
-            exts = exts.split(',')
-            for ext in exts:
-                oid, type = ext.split()
-                self.module.resolve_oidName(oid)
-                self.module.resolve_type(self.get_typeName(type))
-            pass
+            clauses['PLICIT'] = m.value
+        if a is None or a + 1 >= len(toks):
+            return clauses
+        if toks[a + 1].value == 'TEXTUAL-CONVENTION':
+            clauses.update((keyword, text[start:end])
+                           for keyword, (start, end) in clause_spans(toks[a + 2:], _tc_clauses).items())
+        else:
+            # the type after tag and IMPLICIT/EXPLICIT
+            i = e + 1 if e is not None else a + 1
+            if m and i < len(toks) and toks[i] is m:
+                i += 1
+            if i < len(toks):
+                clauses['SYNTAX'] = text[toks[i].start:toks[-1].end]
+        return clauses
 
-        m = re.search(r'(?<=::=)(.|\n)*?\[.*?\]', text)
-        if m:
-            self.TAG = s_strip(m.group())
-        m = re.compile(r'|'.join(_type_plicit)).search(text)
-        if m:
-            self.PLICIT = s_strip(m.group())
+
+# keywords which start a clause of object definition macros
+_oid_clauses = frozenset(("SYNTAX", "UNITS", "ACCESS", "MAX-ACCESS", "MIN-ACCESS", "STATUS", "DESCRIPTION",
+                          "REFERENCE", "INDEX", "AUGMENTS", "DEFVAL", "OBJECTS", "NOTIFICATIONS", "ENTERPRISE",
+                          "VARIABLES", "DISPLAY-HINT", "LAST-UPDATED", "ORGANIZATION", "CONTACT-INFO", "REVISION"))
 
 
 class MibObjectID(MibIdr):
     """
-    object that holds information about oid. immediately parsed.
+    object that holds information about oid. dependencies parsed immediately, clauses when accessed.
     """
+    __slots__ = ()
+    kind = OID
 
-    # def_reg = r'\s+OBJECT([^:\{\}]|\{[^:]+\})+::=\s*\{([^\}]+)\}'  # scapy-version
-    # def_reg = r'\s*OBJECT-TYPE(.|\n)*?::=\s*\{.*?\}'  # my-version
-    def_reg = r'\s*OBJECT(-TYPE| IDENTIFIER)(.|\n)*?::=\s*\{.*?\}'  # my-version2
-
-    # _OID_KEYWORDS = ["SYNTAX", "ACCESS", "STATUS", "DESCRIPTION", "REFERENCE", "INDEX"]
-
-    def __init__(self, module: MibModule, text):
-        MibIdr.__init__(self, module, text)
-
-        self.SYNTAX = ...
-        self.ACCESS = ...
-        self.STATUS = ...
-        self.DESCRIPTION = ...
-        self.REFERENCE = ...
-        self.INDEX = ...
+    SYNTAX = _clause_property('SYNTAX')
+    ACCESS = _clause_property('ACCESS', 'MAX-ACCESS')
+    STATUS = _clause_property('STATUS')
+    DESCRIPTION = _clause_property('DESCRIPTION')
+    REFERENCE = _clause_property('REFERENCE')
+    INDEX = _clause_property('INDEX')
 
+    def _parse(self, toks: list[Token]):
         # extract dependent types
-        m = re.search("(?<=SYNTAX)(.|\n)*?(?=(MAX-)?ACCESS)", text)
-        if m:
+        syntax = clause(toks, 'SYNTAX', ('ACCESS', 'MAX-ACCESS'))
+        if syntax:
             # SYNTAX
-            typeName = MibType.get_typeName(m.group())
-            self.module.resolve_type(typeName)
-        m = re.search('(?<=INDEX)(.|\n)*?(?=::=)', text)
-        if m:
+            typeName = _type_name(syntax)
+            self._require(typeName, MibType)
+        index = clause(toks, 'INDEX', ('::=',))
+        if index:
             # INDEX
-            oids = [s_strip(oid) for oid in _remove_type_keywords(m.group()).strip('\n \t{}').split(',')]
-            for oid in oids:
-                self.module.resolve_oidName(oid)
-
-        en = re.search(r'::=', text)
-        deps_m = re.compile(r'\{(.|\n)+?}').search(text, en.end())
-        deps = deps_m.group().strip('{}').split()
-        for dep in deps:
-            if re.match(r'^(?!\d)(\w|-)+$', dep):
-                self.module.resolve_oidName(dep)
-                self.dependencies[dep] = self.mibParser[dep]
-
-
-class MibRegions:
-    """ each region contains regex match referring to original text region(to save time)"""
-
-    def __init__(self, text):
-        t = Optional[Region]
-        self.START: t = None
-        self.EXPORTS: t = None
-        self.IMPORTS: t = None
-        self.DEFS: t = None
-
-        self._delimit_regions(text)
-
-    def _delimit_regions(self, text):
-        regions_regs = {
-            # 'START': r'(\w|-)+.*DEFINITIONS\s*::=\sBEGIN',
-            'START': r'(\w|-)+(.|\n)*DEFINITIONS\s*::=\s+BEGIN',
-            "EXPORTS": r'EXPORTS(.|\n)*?;',
-            "IMPORTS": r'IMPORTS(.|\n)*?;',
-            "DEFS": '(.|\n)*(=?END)'
-        }
+            for t in index:
+                if t.kind == WORD and t.value not in _types_def_keywords and t.value != 'IMPLIED':
+                    self._require(t.value, MibObjectID)
+
+        # parent: '::= { parent n }'
+        a = find_token(toks, '::=')
+        e = match_bracket(toks, a + 1)
+        for i in range(a + 2, e):
+            dep = toks[i].value
+            if toks[i].kind == WORD and not dep[0].isdigit() and toks[i + 1].value != '(':
+                self._require(dep, MibObjectID)
+                self.dependencies += (dep,)
+
+    @staticmethod
+    def _parse_clauses(text: str, toks: list[Token]) -> dict[str, str]:
+        return {keyword: text[start:end] for keyword, (start, end) in clause_spans(toks, _oid_clauses).items()}
+
 
-        text = "".join(re.split(r'--.*(\r|\n)', text))
+# MibIdr class of each kind of definition
+_idr_classes = {OID: MibObjectID, TYPE: MibType}
 
-        i = 0
-        for regionName, reg in regions_regs.items():
-            m = Region(text, reg, i)
-            setattr(self, regionName, m)
-            if m:
-                i = m.end()
+
+def _oid_position(components: tuple[tuple[Optional[str], Optional[int]], ...]) -> tuple[Optional[str], Optional[int]]:
+    """ (parent name, last arc) of object identifier value components: '{ frxPort 1 }' -> ('frxPort', 1),
+    '{ iso org(3) dod(6) 1 }' -> ('dod', 1) """
+    if len(components) < 2:
+        return None, None
+    return components[-2][0], components[-1][1]
 
 
 class MibModule:
@@ -186,74 +272,82 @@ class MibModule:
      to resolve oid and then will clear relevant text.
      """
 
-    def __init__(self, mibParser: MibParser, path):
-        self.mibParser = mibParser  # parent mibParser
+    def __init__(self, corpus: MibCorpus, path, scan: MibScan = None, text: str = None, base: bool = False):
+        """
+        :param corpus: corpus of loaded and parsed modules which this module belongs to
+        :param scan: already made scan of the module text (by a worker process). if given, the text is read only
+        when required.
+        :param text: already read module text
+        :param base: precompiled base module (see MibBaseSmi). it has no file, so its text is never released
+        """
+        self.corpus = corpus
         self.path = Path(path).resolve()
-        with open(path) as f:
-            text = f.read()
-        self.text = text
-        self.regions = MibRegions(text)
-        if not self.regions.START:
+        self.base = base
+        self._text: Optional[str] = text
+        if scan is None:
+            scan = MibScan(self.text)
+            if corpus.stats:
+                corpus.stats.scan('module')
+        self._region_spans = scan.regions
+        if 'START' not in scan.regions:
             raise Exception(f'unvalid syntax in module {self.path}')
-        self.name = self.regions.START.search(_rDWord).group()
-        if not self.mibParser.fast_load:
-            print(f'parsing moudle {self.name}')
+        self.name = scan.name
+        if not self.corpus.fast_load and not base:
+            logger.info(f'parsing moudle {self.name}')
 
-        # self.regions.DEFS.search('[\w]')
-        # self._i_md_start = re.compile(_rDWord + r' .*DEFINITIONS\s*::=\sBEGIN', re.M).search(text)
-        # self.name = re.compile(_rDWord, re.M).search(text, self._i_md_start.start()).group()
-
-        # {idrName:mibPath which defines idrName}
-        self.imported_idrs: dict[str, str] = {}
-        self._parse_imports()
+        # {idrName:moduleName which defines idrName}
+        self.imported_idrs: dict[str, str] = scan.imported_idrs
 
         # {idrName:MibModule which defines idrName}
         self.requiredModules: dict[str, MibModule] = {}
 
-        # {idrName:idr definition text}
-        self.defined_idrs: dict[str, str] = {}
-        self._parse_all_definitions()
-        # self.idrDefs: dict[str, Union[MibObjectID, MibType]] = {}
-
-    def _parse_imports(self):
-        """ make the module be aware what idrs are imported and from which module """
-        # imports_text = re.search(r'(?<=IMPORTS)(.|\n)*?(?=;)', self.text).group()
-        if not self.regions.IMPORTS: return
-        m = self.regions.IMPORTS.narrow(r'(?<=IMPORTS)(.|\n)*?(?=;)')
-        for imp in m.finditer(r'[\s\S]*?FROM\s+([\w-]+)'):
-            idrs, module = imp.group().split('FROM')
-            idrs = ls_strip(idrs.split(','))
-            module = s_strip(module)
-            for idr in idrs:
-                self.imported_idrs[idr] = module
-
-    def _parse_all_definitions(self):
-        """ build dictionary of {idrName:definition-text} for faster search
-         Note: expensive calculation"""
-        defs = self.regions.DEFS.finditer(f'({_rDWord + MibObjectID.def_reg})|({_rDWord + MibType.def_reg})')
-        for d in defs:
-            m_idrName = d.search(r'[\w-]+')
-            self.defined_idrs[m_idrName.group()] = d.group()
-
-    def resolve_oidName(self, oidName):
-        return self.resolve_identifier(oidName, MibObjectID)
-
-    def resolve_type(self, typeName):
-        return self.resolve_identifier(typeName, MibType)
-
-    def resolve_identifier(self, idrName, _IdrClass=None):
-        if idrName in self.mibParser:
-            return
-            # first resolve modules if required
-        if idrName in self.imported_idrs:
-            moduleName = self.imported_idrs[idrName]
-            if moduleName not in self.requiredModules:
-                self.resolve_module(moduleName)
-            self.requiredModules[moduleName].resolve_identifier(idrName)
+        # {idrName:(start, end, kind)} span of idr definition in text
+        self.defined_idrs: dict[str, tuple[int, int, str]] = scan.defined_idrs
+        # {oidName:((name, number), ...)} components of object identifiers values
+        self.oid_values = scan.oid_values
+        # {oidName:[names of object identifiers defined directly under oidName in this module]}
+        self.children: dict[str, list[str]] = scan.children
+
+        # {idrName:MibIdr} already parsed definitions, shared by all builds
+        self.parsed_idrs: dict[str, MibIdr] = {}
+
+    @property
+    def text(self) -> str:
+        """ module text. read from the file on first use if module was created from a scan """
+        text = self._text
+        if text is None:
+            with open(self.path) as f:
+                text = self._text = f.read()
+        return text
+
+    def definition_text(self, start: int, end: int) -> str:
+        """ text of definition span without comments """
+        return s_strip(strip_comments(self.text[start:end]))
+
+    def release_text(self):
+        """ drop module text to save memory. it will be read again from the file when required """
+        if self.base:
             return
+        self._text = None
 
-        if not self.regions.DEFS:
-            return
+    def resolve_oidName(self, oidName, *, mibParser: MibParser):
+        return self.resolve_identifier(oidName, MibObjectID, mibParser=mibParser)
+
+    def resolve_type(self, typeName, *, mibParser: MibParser):
+        return self.resolve_identifier(typeName, MibType, mibParser=mibParser)
+
+    def resolve_identifier(self, idrName, _IdrClass=None, *, mibParser: MibParser):
+        """ resolve idrName and its dependencies into mibParser build """
+        mibParser.resolve([(self, idrName, _IdrClass)])
+        return mibParser.parsed_identifiers.get(idrName)  # return reference for inner use
+
+    def find_definition(self, idrName, _IdrClass=None) -> Optional[MibIdr]:
+        """
+        parsed definition of idrName defined in this module, or None if it is not defined in this module as
+        _IdrClass (kind of definition chosen by first letter if not given).
+        """
+        if 'DEFS' not in self._region_spans:
+            return None
 
         if not _IdrClass:
             if idrName[0].isupper():
@@ -263,32 +357,627 @@ class MibModule:
                 # this is oid
                 _IdrClass = MibObjectID
 
-        # reg = re.compile(idrName + _IdrClass.def_reg)
-        # idr_m_test = reg.search(self.text)
-
-        idr_m = self.regions.DEFS.search(idrName + _IdrClass.def_reg)
-        # if idr_m_test.group() != idr_m.group():
-        #     raise Exception("error!")
-
-        if not idr_m:
+        span = self.defined_idrs.get(idrName)
+        if not span or span[2] != _IdrClass.kind:
             warnings.warn(f'cant resolve identifier {idrName}')
-            return
-        idr_def_text = s_strip(idr_m.group())  # get idr definition text
-        idr = _IdrClass(self, idr_def_text)
-        return idr  # return reference for inner use
+            return None
+        return self.parse_identifier(idrName)
+
+    def locate_definition(self, idrName, _IdrClass=None) -> tuple[Optional[MibIdr], list[MibModule]]:
+        """
+        definition which idrName refers to from this module, following imports like resolving does (but without
+        warnings), and the imported modules visited on the way.
+        """
+        module = self
+        visited = []
+        while idrName in module.imported_idrs:
+            module = module.required_module(module.imported_idrs[idrName])
+            if module is None or module in visited:
+                return None, visited
+            visited.append(module)
+        if 'DEFS' not in module._region_spans:
+            return None, visited
+        if not _IdrClass:
+            _IdrClass = MibType if idrName[0].isupper() else MibObjectID
+        span = module.defined_idrs.get(idrName)
+        if not span or span[2] != _IdrClass.kind:
+            return None, visited
+        return module.parse_identifier(idrName), visited
+
+    def parse_identifier(self, idrName) -> Optional[MibIdr]:
+        """ parsed definition of idrName. each definition is parsed only once and shared by all builds.
+        builds in other threads may parse it at the same time, the first registered definition is kept """
+        idr = self.parsed_idrs.get(idrName)
+        stats = self.corpus.stats
+        if idr:
+            if stats:
+                stats.hit('identifiers')
+            return idr
+        span = self.defined_idrs.get(idrName)
+        if not span:
+            return None
+        if stats:
+            stats.miss('identifiers')
+            stats.scan('identifier')
+        start, end, kind = span
+        idr = _idr_classes[kind](self, idrName, start, end)
+        return self.parsed_idrs.setdefault(idrName, idr)
+
+    def iter_definitions(self) -> Iterator[dict]:
+        """
+        yield a record of each definition of the module in definition order: name, module, kind ('oid' or 'type'),
+        parent and sub_id (its last arc) of object identifiers, and SYNTAX, ACCESS and STATUS clauses (None if the
+        definition has no such clause, the syntax of types is their type, see MibType). only the clauses of
+        definitions which are not parsed yet are parsed, and they are not kept, so iterating doesn't grow the module
+        """
+        for name, (start, end, kind) in self.defined_idrs.items():
+            idr = self.parsed_idrs.get(name)
+            if idr:
+                clauses = idr.clauses
+            else:
+                text = self.definition_text(start, end)
+                clauses = _idr_classes[kind]._parse_clauses(text, tokenize(text))
+            parent, sub_id = _oid_position(self.oid_values.get(name, ()))
+            yield {'name': name, 'module': self.name, 'kind': kind, 'parent': parent, 'sub_id': sub_id,
+                   'syntax': _first_clause(clauses, 'SYNTAX'), 'access': _first_clause(clauses, 'ACCESS', 'MAX-ACCESS'),
+                   'status': _first_clause(clauses, 'STATUS')}
+
+    def required_module(self, moduleName) -> Optional[MibModule]:
+        """ imported module moduleName. resolved on first use """
+        if moduleName in self.requiredModules:
+            return self.requiredModules[moduleName]
+        return self.resolve_module(moduleName)
+
+    def defining_module(self, idrName) -> Optional[MibModule]:
+        """ module which defines idrName as seen from this module (this module or imported one) """
+        module = self
+        visited = set()
+        while idrName in module.imported_idrs and module not in visited:
+            visited.add(module)
+            module = module.required_module(module.imported_idrs[idrName])
+            if module is None:
+                return None
+        return module if idrName in module.defined_idrs else None
 
     def resolve_module(self, moduleName):
-        path = Path(self.path).parent / moduleName
-        try:
-            _path = glob(str(path) + '.*')[0]
-        except IndexError:
-            warnings.warn(f"can't resolve module {moduleName} at path {path}")
-            return
-        module = MibModule(self.mibParser, _path)
+        module = self.corpus.parsed_modules.get(moduleName)
+        if module:
+            self.corpus.avoided_parse()
+        else:
+            _path = self.corpus.locator.find(moduleName, self.path.parent)
+            if not _path:
+                warnings.warn(f"can't resolve module {moduleName} at path {self.path.parent / moduleName}")
+                return
+            module = self.corpus.get_module(_path)
         self.requiredModules[moduleName] = module
         return module
 
 
+# loading algorithms (values of MibParser fast_load)
+FAST_LOAD = True
+FAST_SEARCH = False
+HYBRID = 'hybrid'
+
+# estimated costs in seconds, used for choosing loading algorithm automatically
+_open_cost = 40e-6  # per file
+_read_cost = 1e-9  # per byte
+_heads_cost = 14e-9  # per byte, searching definition heads
+_scan_cost = 120e-9  # per byte, scanning module definitions
+_pool_cost = 0.1  # starting worker processes
+
+
+def build_oid_tree(definitions: Iterable[tuple[MibModule, str]]) -> OidTree:
+    """
+    numeric oid tree of object identifiers definitions (module, oidName).
+    names in oid values are resolved from the module which uses them (its definitions and imports). the oid of every
+    definition is computed once, parents before children, without recursion.
+    """
+    tree = OidTree()
+    # {(module, oidName):oid or None if it can't be computed}
+    oids: dict[tuple[MibModule, str], Optional[tuple[int, ...]]] = {}
+    for key in definitions:
+        stack = [key]
+        while stack:
+            module, oidName = key = stack[-1]
+            if key in oids:
+                stack.pop()
+                continue
+            components = module.oid_values.get(oidName)
+            if not components:
+                oids[key] = None
+                stack.pop()
+                continue
+            (name, number), *arcs = components
+            oid = None
+            if number is not None:
+                oid = (number,)
+            else:
+                parentModule = module.defining_module(name)
+                parentKey = (parentModule, name)
+                if parentModule is None or name not in parentModule.oid_values:
+                    oid = (root_arcs[name],) if name in root_arcs else None
+                elif parentKey not in oids:
+                    if parentKey in stack:
+                        # circular definition
+                        oids[key] = None
+                        stack.pop()
+                    else:
+                        stack.append(parentKey)
+                    continue
+                else:
+                    oid = oids[parentKey]
+            if oid is not None:
+                if name is not None:
+                    tree.add(name, oid)
+                for name, number in arcs:
+                    if number is None:
+                        oid = None
+                        break
+                    oid += (number,)
+                    if name is not None:
+                        tree.add(name, oid)
+            if oid is not None:
+                tree.add(oidName, oid)
+            oids[key] = oid
+            stack.pop()
+    return tree
+
+
+class MibCorpus:
+    """
+     loaded mib files and registry of all parsed modules. shared by all the builds (MibParser) made from it.
+
+     load the mibs once and make as many builds as needed: every module is parsed and every identifier definition
+     is parsed only once for all the builds.
+
+     the corpus may be shared by builds running in many threads (or an asyncio executor) at once, each build has its
+     own identifiers and resolving state. lookups of parsed modules and definitions don't lock, files are read and
+     parsed outside of the lock (so slow file systems are read concurrently) and only registering them, loading mibs
+     and searching the loaded mibs are serialized.
+     """
+
+    def __init__(self, mibs_paths: Union[list[pathType], pathType] = None,
+                 fast_load: Union[bool, str, None] = FAST_LOAD, cache_dir: pathType = None, workers: int = 1,
+                 low_memory: bool = False, stats: MibStats = None, idrs_count: int = 0, io_workers: int = 1,
+                 mibs_dirs: Iterable[pathType] = (), extensions: Iterable[str] = None, base_smi: bool = False):
+        """
+        :param mibs_paths: list of mibs that will be loaded and searched for identifiers which required without mib path
+        :param fast_load: loading algorithm, see MibParser
+        :param cache_dir: directory of persistent identifier index and scans cache of mibs, see MibParser
+        :param workers: number of worker processes used by FAST SEARCHING algorithm to parse loaded mib files.
+        :param low_memory: don't keep texts of loaded mibs in memory, see MibParser
+        :param stats: observer which collects statistics of loading and building
+        :param idrs_count: expected number of searched identifiers. used for choosing loading algorithm automatically
+        :param io_workers: number of threads reading mib files ahead, see MibParser
+        :param mibs_dirs: directories searched for imported modules, see MibParser
+        :param extensions: extensions of mib files in searched directories (default MibParser.mib_exteinsons)
+        :param base_smi: start with the precompiled base SMI modules in the registry, see MibParser
+        """
+        if mibs_paths is None:
+            mibs_paths = []
+        if type(mibs_paths) != list:
+            mibs_paths = [mibs_paths]
+
+        self.workers = workers
+        self.stats = stats
+        if fast_load is None:
+            fast_load = self.choose_algorithm([file for reg in mibs_paths for file in glob(reg)], idrs_count, workers)
+        self.fast_load = fast_load
+        self.low_memory = low_memory
+        # persistent {idrName:[(mibPath, offset, kind)]} index of loaded mibs
+        self.index: Optional[MibIndex] = MibIndex(cache_dir) if cache_dir else None
+        # files of imported modules by module name
+        self.locator = MibLocator(mibs_dirs, MibParser.mib_exteinsons if extensions is None else extensions)
+        # threads reading files ahead, {resolved path:reading of file} of required and imported modules not parsed
+        # yet. dropped by release_texts and close
+        self.io_workers = io_workers
+        self._io: Optional[ThreadPoolExecutor] = ThreadPoolExecutor(io_workers) if io_workers > 1 else None
+        self._prefetched_files: dict[Path, Future] = {}
+        # guards the registry, loaded mibs and searching tables when builds run in many threads
+        self._lock = threading.RLock()
+
+        # registry of all parsed modules shared by all imports: {moduleName:MibModule} and {resolved path:MibModule}
+        self.parsed_modules: dict[str, MibModule] = {}
+        self._parsed_paths: dict[Path, MibModule] = {}
+        # number of module parses avoided by the registry
+        self.parses_avoided = 0
+        self.base_smi = base_smi
+        if base_smi:
+            for path, scan, text in base_modules():
+                module = MibModule(self, path, scan, text, base=True)
+                self._parsed_paths[module.path] = module
+                self.parsed_modules[module.name] = module
+
+        self.loaded_parsed_mibs: dict[str, MibModule] = {}
+        self.loaded_text_mibs: dict[str, Optional[str]] = {}
+        # {indexed path:loaded mib path} and {loaded mib path:loading position}
+        self._loaded_keys: dict[str, str] = {}
+        self._load_order: dict[str, int] = {}
+        # {idrName:[loaded mib paths which defines idrName]} of already searched identifiers
+        self._identifiers_mibs: dict[str, list[str]] = {}
+        # true if definition heads of all loaded mibs are already in _identifiers_mibs
+        self._heads_searched = False
+        # {loaded mib path:MibScan} definitions tables of already searched mibs (hybrid algorithm)
+        self._loaded_scans: dict[str, MibScan] = {}
+        # {oidName:[(loaded mib path, child name)]} object identifiers defined directly under oidName in the loaded
+        # mibs, in loading order. made on first subtree search
+        self._children: Optional[dict[str, list[tuple[str, str]]]] = None
+        self.load_mibs(mibs_paths)
+
+    def build(self, mainModuleName='my-mib', idrs_list: list[str] = None, idrs_dict: dict[str, str] = None) -> MibParser:
+        """ build a new module of the given identifiers and their dependencies from the corpus """
+        return MibParser(mainModuleName, idrs_dict=idrs_dict, idrs_list=idrs_list, corpus=self)
+
+    def _search_identifiers(self, idrs: Iterable[str]) -> dict[str, list[str]]:
+        """ find which loaded mib files define each of the given identifiers not searched yet.
+        with an index they are looked up in it. every loaded mib is indexed, so names which are not in the index are
+        not defined in any loaded mib and no file is read for them. without an index the names are searched together
+        in a single pass over each loaded mib. this pass records all the definition heads so later searches don't
+        require another pass.
+        return {idrName:[loaded mib paths which defines idrName]} of the given identifiers """
+        idrs = list(idrs)
+        with self._lock:
+            pending = {idrName for idrName in idrs if idrName not in self._identifiers_mibs}
+            found: dict[str, list[str]] = {idrName: [] for idrName in pending}
+            if self.index:
+                for idrName in pending:
+                    found[idrName] = self._get_mibs_from_index(idrName)
+            elif pending and not self._heads_searched:
+                for path in self.loaded_text_mibs:
+                    if self.stats:
+                        self.stats.scan('heads')
+                    for idrName in self._get_definition_heads(path):
+                        # every file of every head is recorded, heads may be false positives (like in comments)
+                        if idrName not in self._identifiers_mibs:
+                            paths = found.setdefault(idrName, [])
+                            if path not in paths:
+                                paths.append(path)
+                self._heads_searched = True
+            self._identifiers_mibs.update(found)
+            return {idrName: self._identifiers_mibs.get(idrName, []) for idrName in idrs}
+
+    def _get_mibs_from_index(self, idrName: str) -> list[str]:
+        """ loaded mib files which defines idrName according to the index, in loading order """
+        paths = {self._loaded_keys[path] for path, offset, kind in self.index.lookup(idrName)
+                 if path in self._loaded_keys}
+        if self.stats and paths:
+            self.stats.hit('index')
+        elif self.stats:
+            self.stats.miss('index')
+        return sorted(paths, key=self._load_order.get)
+
+    def _get_definition_heads(self, path) -> set[str]:
+        """ names of all definition heads in loaded mib file.
+        in low memory mode the file is memory-mapped and released after searching """
+        if not self.low_memory:
+            return definition_heads(self._get_loaded_text(path))
+        if not os.path.getsize(path):
+            return set()
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return definition_heads(mm)
+
+    def _get_loaded_text(self, path) -> str:
+        """ text of loaded mib file. files which are up to date in the index are read only when needed """
+        if self.loaded_text_mibs[path] is None:
+            with open(path) as f:
+                self.loaded_text_mibs[path] = f.read()
+        return self.loaded_text_mibs[path]
+
+    def _read_files(self, files: list[str]) -> Iterator[tuple[str, str]]:
+        """ (file, text) of files in the given order. files are read ahead by the io threads """
+        return prefetch(read_file, files, self._io, 2 * self.io_workers)
+
+    def prefetch_imports(self, module: MibModule, idrNames: Iterable[str]):
+        """ start reading files of the modules which idrNames are imported from by module before they are resolved """
+        if not self._io or self.low_memory:
+            return
+        moduleNames = dict.fromkeys(module.imported_idrs[idrName] for idrName in idrNames
+                                    if idrName in module.imported_idrs)
+        paths = (self.locator.find(moduleName, module.path.parent) for moduleName in moduleNames
+                 if moduleName not in self.parsed_modules)
+        self.prefetch_files(path for path in paths if path)
+
+    def prefetch_files(self, paths: Iterable[pathType]):
+        """ start reading files of not yet parsed modules which are going to be required """
+        if not self._io or self.low_memory:
+            return
+        for path in paths:
+            key = Path(path).resolve()
+            with self._lock:
+                if key not in self._parsed_paths and key not in self._prefetched_files:
+                    self._prefetched_files[key] = self._io.submit(read_file, path)
+
+    def _get_loaded_scan(self, path) -> MibScan:
+        """ definitions table of loaded mib file. built the first time the file is searched """
+        scan = self._loaded_scans.get(path)
+        if scan:
+            if self.stats:
+                self.stats.hit('scans')
+            return scan
+        with self._lock:
+            if path in self._loaded_scans:
+                return self._loaded_scans[path]
+            if self.stats:
+                self.stats.miss('scans')
+            if self.index:
+                scan, text = self._cached_scan(path, self.loaded_text_mibs[path])
+                if not self.low_memory:
+                    self.loaded_text_mibs[path] = text
+            else:
+                scan = scan_file(path) if self.low_memory else MibScan(self._get_loaded_text(path))
+                if self.stats:
+                    self.stats.scan('module')
+            self._loaded_scans[path] = scan
+            return scan
+
+    def _children_index(self) -> dict[str, list[tuple[str, str]]]:
+        """ children index of the loaded mibs. made from their scans, loaded mibs which were not searched yet are
+        scanned (or their scans are taken from cache_dir) """
+        children = self._children
+        if children is not None:
+            return children
+        with self._lock:
+            if self._children is None:
+                children = {}
+                tables = [(path, module.children) for path, module in self.loaded_parsed_mibs.items()]
+                tables += [(path, self._get_loaded_scan(path).children) for path in self.loaded_text_mibs]
+                for path, moduleChildren in tables:
+                    for oidName, names in moduleChildren.items():
+                        children.setdefault(oidName, []).extend((path, name) for name in names)
+                self._children = children
+            return self._children
+
+    def _loaded_module(self, path) -> MibModule:
+        """ parsed module of loaded mib file. looking up an already parsed module is not counted as reuse of the
+        registry, the module is parsed (see get_module) only if it is not parsed yet """
+        module = self.loaded_parsed_mibs.get(path) or self._parsed_paths.get(Path(path).resolve())
+        return module or self.get_module(path, self._loaded_scans.get(path), self.loaded_text_mibs.get(path))
+
+    def children(self, module: Optional[MibModule], oidName: str) -> list[tuple[MibModule, str]]:
+        """
+        (module, name) of object identifiers defined directly under oidName of module (which defines it, None for
+        builtin names like 'iso'): in module itself and in the loaded mibs where oidName refers to the same definition
+        """
+        found = [(module, name) for name in module.children.get(oidName, ())] if module else []
+        for path, name in self._children_index().get(oidName, ()):
+            childModule = self._loaded_module(path)
+            if childModule is not module and childModule.defining_module(oidName) is module:
+                found.append((childModule, name))
+        return found
+
+    def _cached_scan(self, path, text: str = None) -> tuple[MibScan, Optional[str]]:
+        """
+        scan of mib file from the index cache, by file stat or by content hash. scanned and cached if not found.
+        return the scan and file text if it was read
+        """
+        h = self.index.fresh_hash(path)
+        scan = self.index.scan(h) if h else None
+        if scan:
+            if self.stats:
+                self.stats.hit('modules')
+            return scan, text
+        if text is None:
+            text = read_file(path)
+        h = file_hash(text)
+        scan = self.index.scan(h)
+        if scan is None:
+            scan = MibScan(text)
+            if self.stats:
+                self.stats.miss('modules')
+                self.stats.scan('module')
+        elif self.stats:
+            self.stats.hit('modules')
+        self.index.update(path, text, scan, h)
+        return scan, text
+
+    def avoided_parse(self):
+        """ count a module found in the registry """
+        with self._lock:
+            self.parses_avoided += 1
+        if self.stats:
+            self.stats.hit('registry')
+
+    def get_module(self, path, scan: MibScan = None, text: str = None) -> MibModule:
+        """ parsed module of mib file from the modules registry. each file is parsed only once.
+        the file is read and parsed without locking, if another thread registers it meanwhile its module is kept """
+        key = Path(path).resolve()
+        module = self._parsed_paths.get(key)
+        if module:
+            self.avoided_parse()
+            return module
+        prefetched = None
+        if scan is None and text is None:
+            with self._lock:
+                prefetched = self._prefetched_files.pop(key, None)
+        if prefetched:
+            text = prefetched.result()
+        start = time.perf_counter()
+        if scan is None and self.index:
+            scan, text = self._cached_scan(path, text)
+        module = MibModule(self, path, scan, text)
+        with self._lock:
+            if key in self._parsed_paths:
+                self.avoided_parse()
+                return self._parsed_paths[key]
+            if self.stats:
+                self.stats.miss('registry')
+                self.stats.module_parsed(module.name, time.perf_counter() - start, os.path.getsize(path))
+            if self.low_memory:
+                module.release_text()
+            self._parsed_paths[key] = module
+            self.parsed_modules.setdefault(module.name, module)
+        return module
+
+    def oid_tree(self) -> OidTree:
+        """ numeric oid tree of all object identifiers defined in the loaded mibs and the parsed modules.
+        loaded mibs which are not parsed yet are parsed """
+        for path in list(self.loaded_text_mibs):
+            self.get_module(path, self._loaded_scans.get(path), self.loaded_text_mibs[path])
+        modules = list(self._parsed_paths.values())
+        return build_oid_tree((module, oidName) for module in modules for oidName in module.oid_values)
+
+    def release_texts(self):
+        """ drop texts of all parsed modules and files read ahead which were not required """
+        for module in list(self._parsed_paths.values()):
+            module.release_text()
+        self._drop_prefetched()
+
+    def _drop_prefetched(self):
+        """ cancel reading ahead of files which were not required yet """
+        with self._lock:
+            prefetched, self._prefetched_files = self._prefetched_files, {}
+        for future in prefetched.values():
+            future.cancel()
+
+    def content_hash(self, path) -> str:
+        """ content hash of file. taken from the index if the file is up to date in it. '' if there is no file, the
+        text of base modules is hashed """
+        module = self._parsed_paths.get(Path(path))
+        if module is not None and module.base:
+            return file_hash(module.text)
+        if not os.path.exists(path):
+            return ''
+        h = self.index.fresh_hash(path) if self.index else None
+        return h or file_hash(read_file(path))
+
+    def is_loaded(self, path) -> bool:
+        return path in self.loaded_text_mibs or path in self.loaded_parsed_mibs
+
+    def close(self):
+        """ stop io threads and close the index """
+        self._drop_prefetched()
+        if self._io:
+            self._io.shutdown()
+        if self.index:
+            self.index.close()
+
+    def load_mibs_fast_load(self, mibFiles):
+        """ fast loading algorithm but slower searching time
+       choose this if you have a lot of mib files and small amount of oids"""
+        files = []
+        for file in mibFiles:
+            self._load_order[file] = len(self._load_order)
+            self.loaded_text_mibs[file] = None
+            if self.index:
+                self._loaded_keys[MibIndex._key(file)] = file
+                if self.index.is_fresh(file):
+                    if self.stats:
+                        self.stats.hit('index_files')
+                    continue
+                if self.stats:
+                    self.stats.miss('index_files')
+            elif self.low_memory:
+                continue
+            files.append(file)
+        for file, text in self._read_files(files):
+            if self.index:
+                self.index.update(file, text)
+            if not self.low_memory:
+                self.loaded_text_mibs[file] = text
+
+        # if idrName in self.parsed_identifiers:
+        #     return self.parsed_identifiers[idrName].module.name
+        #
+        # for mibPath, mibModule in self.loaded_mibs.items():
+        #     if idrName in mibModule.defined_idrs:
+        #         mibModule.resolve_identifier(idrName)
+
+    def load_mibs_fast_search(self, mibFiles):
+        """ fast searching algorithm but slower loading time
+        choose this if you have a lot of oids to search in small amount of mib files"""
+        scans = {}
+        files = [file for file in mibFiles if Path(file).resolve() not in self._parsed_paths]
+        if self.index:
+            # scans of files which are up to date in the index cache
+            for file in files:
+                h = self.index.fresh_hash(file)
+                scan = self.index.scan(h) if h else None
+                if scan:
+                    scans[file] = scan
+                    if self.stats:
+                        self.stats.hit('modules')
+            files = [file for file in files if file not in scans]
+        if self.workers > 1:
+            # scan not yet parsed files in worker processes and merge the scans in loading order
+            with ProcessPoolExecutor(self.workers) as executor:
+                chunksize = max(1, len(files) // (self.workers * 4))
+                scanned = dict(zip(files, executor.map(scan_file, files, chunksize=chunksize)))
+            if self.stats:
+                for _ in scanned:
+                    self.stats.scan('module')
+            if self.index:
+                for file, scan in scanned.items():
+                    self.index.update(file, read_file(file), scan)
+            scans.update(scanned)
+        # read not yet parsed files ahead
+        reads = self._read_files([file for file in mibFiles
+                                  if file not in scans and Path(file).resolve() not in self._parsed_paths])
+        read = next(reads, None)
+        for file in mibFiles:
+            text = None
+            if read and read[0] == file:
+                text = read[1]
+                read = next(reads, None)
+            # Note: MibModule(...) operation takes a lot of time for many files
+            self.loaded_parsed_mibs[file] = self.get_module(file, scans.get(file), text)
+
+    @staticmethod
+    def choose_algorithm(mibFiles: list[pathType], idrsCount: int, workers: int = 1) -> Union[bool, str]:
+        """
+        choose loading algorithm with the lowest estimated cost of loading mibFiles and searching idrsCount
+        identifiers in them: FAST_LOAD, FAST_SEARCH or HYBRID
+        """
+        filesCount = len(mibFiles)
+        size = sum(os.path.getsize(file) for file in mibFiles)
+        load = filesCount * _open_cost + size * _read_cost
+        costs = {
+            # searching heads in all files, scanning files which defines the identifiers
+            FAST_LOAD: load + size * _heads_cost + size * _scan_cost * min(1, idrsCount / max(filesCount, 1)),
+            # scanning all files while loading
+            FAST_SEARCH: load + size * _scan_cost / workers + (_pool_cost if workers > 1 else 0),
+            # scanning files until the last identifier is found
+            HYBRID: load + size * _scan_cost * idrsCount / (idrsCount + 1),
+        }
+        return min(costs, key=costs.get)
+
+    def load_mibs(self, paths: list[pathType]):
+        """
+        load mib text files into dict
+        choosing best fastest to do so automatically.
+        builds searching the loaded mibs in other threads wait until loading ends.
+         """
+        files = list(dict.fromkeys(file for reg in paths for file in glob(reg)))
+        with self._lock:
+            # files which are already loaded are skipped
+            mibFiles = [file for file in files if not self.is_loaded(file)]
+            if not mibFiles:
+                return
+            self._identifiers_mibs.clear()
+            self._heads_searched = False
+            self._children = None
+
+            if self.fast_load == HYBRID:
+                logger.info('using hybrid algorithm')
+                self.load_mibs_fast_load(mibFiles)
+            elif self.fast_load:
+                logger.info('using fast loading algorithm')
+                self.load_mibs_fast_load(mibFiles)
+            else:
+                logger.info('using fast searching algorithm')
+                self.load_mibs_fast_search(mibFiles)
+
+# marks the end of the dependencies of an identifier on the resolving stack
+_dependencies_resolved = object()
+
+
+def _corpus_alias(name: str) -> property:
+    """ deprecated alias of MibParser attribute which moved to its corpus """
+    def get(self: MibParser):
+        warnings.warn(f'MibParser.{name} is deprecated, use MibParser.corpus.{name}', DeprecationWarning, stacklevel=2)
+        return getattr(self.corpus, name)
+    return property(get)
+
+
 class MibParser:
     """
      receives a dict of object identifiers(oids), and build a mib which includes all their definitions and their dependencies.
@@ -301,16 +990,61 @@ class MibParser:
 
     mib_exteinsons = ('my', 'mib', 'txt')
 
+    # loaded mibs and parsed modules moved to the corpus of the build (see MibCorpus)
+    fast_load = _corpus_alias('fast_load')
+    workers = _corpus_alias('workers')
+    low_memory = _corpus_alias('low_memory')
+    index = _corpus_alias('index')
+    stats = _corpus_alias('stats')
+    loaded_parsed_mibs = _corpus_alias('loaded_parsed_mibs')
+    loaded_text_mibs = _corpus_alias('loaded_text_mibs')
+    parsed_modules = _corpus_alias('parsed_modules')
+    parses_avoided = _corpus_alias('parses_avoided')
+    get_module = _corpus_alias('get_module')
+    load_mibs_fast_load = _corpus_alias('load_mibs_fast_load')
+    load_mibs_fast_search = _corpus_alias('load_mibs_fast_search')
+    choose_algorithm = staticmethod(MibCorpus.choose_algorithm)
+
     def __init__(self, mainModuleName='my-mib', idrs_dict: dict[str, str] = None, idrs_list: list[str] = None,
-                 mibs_paths: Union[list[pathType], pathType] = None, fast_load: bool = True):
+                 mibs_paths: Union[list[pathType], pathType] = None, fast_load: Union[bool, str, None] = FAST_LOAD,
+                 cache_dir: pathType = None, workers: int = 1, low_memory: bool = False, stats: MibStats = None,
+                 io_workers: int = 1, corpus: MibCorpus = None, mibs_dirs: Iterable[pathType] = (),
+                 build_manifest: pathType = None, base_smi: bool = False, emit_base: bool = True):
         """
 
         :param mainModuleName: the name of the module that will be generated using eject_mib() method
         :param idrs_dict: a dictionary of oid:mibPath pairs. for example {"sysObjectID":"./RFC1213-MIB.my"}
-        :param idrs_list: a list of oids that will be resolve from mibs}
+        :param idrs_list: a list of oids that will be resolve from mibs}. ValueError is raised if one of them is not
+        defined in the loaded mibs
         :param mibs_paths: list of mibs that will be loaded and when oid doesn't resolve it will be looked at this
         :param fast_load: if set to true FAST LOADING algorithm will be chosen, else FAST SEARCHING algorithm will be chosen.
-        if not given algorithm chosen automatically.
+        if set to 'hybrid' HYBRID algorithm will be chosen: mibs are loaded like FAST LOADING but the definitions table
+        of each mib is built the first time the mib is searched and reused for later identifiers.
+        if set to None algorithm chosen automatically by the estimated cost of each algorithm.
+        :param cache_dir: directory of persistent identifier index of loaded mibs. used by FAST LOADING algorithm to
+        find identifiers without scanning all loaded mib files. also caches the scan of each parsed mib by its content
+        hash, so unchanged mibs are not scanned again on later runs.
+        :param workers: number of worker processes used by FAST SEARCHING algorithm to parse loaded mib files.
+        :param low_memory: don't keep texts of loaded mibs in memory. FAST LOADING algorithm memory-maps the files
+        while searching them and parsed modules read their text again from the file only when required.
+        :param stats: observer which collects statistics of the building (parse times, scans, cache hits, resolution
+        latencies). nothing is collected if not given.
+        :param io_workers: number of threads reading mib files. if more than 1 loaded mibs are read ahead in loading
+        order and files of imported modules are read as soon as identifiers imported from them are required.
+        :param corpus: already loaded corpus (see MibCorpus) to build from. fast_load, cache_dir, workers, low_memory,
+        stats, io_workers and base_smi are ignored if given and mibs_paths are loaded into the corpus. the corpus may be
+        shared by builds in other threads, the build itself belongs to one thread.
+        :param mibs_dirs: directories searched (in order) for the files of imported modules after the directory of
+        the importing module. files are found by module name even if they are not named by their module. can't be
+        given with corpus, the directories of a corpus are given when it is made (see MibCorpus).
+        :param build_manifest: file recording the build for incremental rebuilding. if it exists, the requested
+        identifiers of the previous build whose files didn't change are not resolved again (and mibs_paths are loaded
+        only if some identifier must be searched), then it is replaced by the record of this build. the built module
+        is the same as a clean build.
+        :param base_smi: use the precompiled base SMI modules (see MibBaseSmi) instead of parsing RFC1155-SMI (and the
+        other shipped modules) from files. imports of them are resolved without reading any file.
+        :param emit_base: include the definitions of the precompiled modules in the built module. if false they are
+        left out and imported instead ('IMPORTS names FROM RFC1155-SMI;').
         """
         if mibs_paths is None:
             mibs_paths = []
@@ -321,7 +1055,19 @@ class MibParser:
         if idrs_dict is None:
             idrs_dict = {}
 
-        self.fast_load = fast_load
+        if corpus is None:
+            if fast_load is None:
+                fast_load = MibCorpus.choose_algorithm([file for reg in mibs_paths for file in glob(reg)],
+                                                       len(idrs_list), workers)
+            corpus = MibCorpus(fast_load=fast_load, cache_dir=cache_dir, workers=workers, low_memory=low_memory,
+                               stats=stats, io_workers=io_workers, mibs_dirs=mibs_dirs, extensions=self.mib_exteinsons,
+                               base_smi=base_smi)
+        elif mibs_dirs:
+            # imports of the shared modules are resolved once for all the builds of the corpus
+            raise ValueError('mibs_dirs of a build from a corpus must be given to the corpus (MibCorpus(mibs_dirs=...))')
+        # loaded mibs and parsed modules. may be shared with other builds
+        self.corpus = corpus
+        self.emit_base = emit_base
 
         # idrs that shoud be included in the final generated mib file
         self.required_idrs = list(idrs_dict) + idrs_list
@@ -333,117 +1079,304 @@ class MibParser:
 
         # all required modules to parse required_idrs
         self.modules: dict[str, MibModule] = {}
-        self.require_identifiers(idrs_dict)
+        # start time of the search and resolving of the currently requested identifier (only when collecting stats)
+        self._request_start: Optional[float] = None
+        # number of requested identifiers reused from the previous build (see build_manifest)
+        self.reused = 0
+        previous = BuildManifest.load(build_manifest) if build_manifest else None
+        if previous:
+            self._rebuild(previous, idrs_dict, idrs_list, mibs_paths)
+        else:
+            self.require_identifiers(idrs_dict)
 
-        # load mibs needed to resolve idrs_list
-        self.loaded_parsed_mibs: dict[str, MibModule] = {}
-        self.loaded_text_mibs: dict[str, str] = {}
-        self.load_mibs(mibs_paths)
-        # self.loaded_mibs: dict[str, str] = {}
+            # load mibs needed to resolve idrs_list
+            if mibs_paths:
+                self.load_mibs(mibs_paths)
+
+            # start the main logic of searching and resolving oids in the mibs
+            self.require_identifier_list(idrs_list)
+
+        if build_manifest:
+            BuildManifest.record(self, idrs_dict, idrs_list, mibs_paths).save(build_manifest)
 
-        # start the main logic of searching and resolving oids in the mibs
-        self.require_identifier_list(idrs_list)
+        if self.corpus.low_memory:
+            self.corpus.release_texts()
 
-        print(f'Finished building {self.mainModuleName}')
+        logger.info(f'Finished building {self.mainModuleName}')
 
     def _get_mib_from_identifier(self, idrName: str) -> str:
         """ search for specific identifier definition in a text mib file """
         # check if idrName already resolved
         if idrName in self.parsed_identifiers:
             return self.parsed_identifiers[idrName].module.name
-        if self.fast_load:
+        if self.corpus.fast_load == HYBRID:
+            self._get_mib_from_identifier_hybrid(idrName)
+        elif self.corpus.fast_load:
             self._get_mib_from_identifier_fast_load(idrName)
         else:
             self._get_mib_from_identifier_fast_search(idrName)
 
     def _get_mib_from_identifier_fast_load(self, idrName: str):
         # resolve idrName from unparsed loaded mib files
-        oid_c = re.compile(f'({idrName + MibObjectID.def_reg})|({idrName + MibType.def_reg})')
-        if self.fast_load:
-            print(f'searching oid {idrName}')
-        for path, val in self.loaded_text_mibs.items():
-            m = oid_c.search(val)
-            if m:
-                self.require_identifiers({idrName: path})
+        logger.info(f'searching oid {idrName}')
+        for path in self.corpus._search_identifiers([idrName])[idrName]:
+            self.require_identifiers({idrName: path})
+
+    def _get_mib_from_identifier_hybrid(self, idrName: str):
+        # resolve idrName from the first loaded mib which defines it. mibs are scanned only once
+        logger.info(f'searching oid {idrName}')
+        corpus = self.corpus
+        # every loaded mib is indexed, so only the mibs which define idrName by the index are scanned
+        paths = corpus._get_mibs_from_index(idrName) if corpus.index else list(corpus.loaded_text_mibs)
+        for path in paths:
+            scan = corpus._get_loaded_scan(path)
+            if idrName not in scan.defined_idrs:
+                continue
+            if path not in self.modules:
+                self.modules[path] = corpus.get_module(path, scan, corpus.loaded_text_mibs[path])
+            self.require_identifiers({idrName: path})
+            if idrName in self:
+                return
 
     def _get_mib_from_identifier_fast_search(self, idrName: str):
-        for mibPath, mibModule in self.loaded_parsed_mibs.items():
+        for mibPath, mibModule in list(self.corpus.loaded_parsed_mibs.items()):
             if idrName in mibModule.defined_idrs:
-                mibModule.resolve_identifier(idrName)
+                mibModule.resolve_identifier(idrName, mibParser=self)
 
     def require_identifier_list(self, idrs: list[str]):
         """ parse list of identifiers without mibPath then search what mib defines this ldr from loaded_mibs and
         return dict of {idr:mibPath} pairs
         fast load.
+        raise ValueError if an identifier is not defined in any loaded mib
         """
 
+        if self.corpus.fast_load and self.corpus.fast_load != HYBRID:
+            self.corpus._search_identifiers([idrName for idrName in idrs if idrName not in self])
         for idrName in idrs:
-            self.require_identifiers({idrName: self._get_mib_from_identifier(idrName)})
+            self._request_start = time.perf_counter() if self.corpus.stats else None
+            try:
+                self._get_mib_from_identifier(idrName)
+            finally:
+                self._request_start = None
+            if idrName not in self:
+                raise ValueError(f'identifier {idrName} not found in the loaded mibs')
+
+    def require_subtree(self, idrName: str, path: pathType = None) -> list[str]:
+        """
+        require object identifier idrName and every object identifier under it with their dependencies.
+        idrName is searched in the loaded mibs if path of its mib is not given. its descendants are found in its module
+        and in the loaded mibs by the children index of the corpus, so finding them costs the size of the subtree.
+        return names of idrName and its descendants, depth first with children in definition order (empty if idrName
+        is not found)
+        """
+        if idrName in self.parsed_identifiers:
+            pass
+        elif path is None:
+            # resolves idrName if it is found in the loaded mibs
+            self._get_mib_from_identifier(idrName)
+        else:
+            self.require_identifiers({idrName: path})
+        root = self.parsed_identifiers.get(idrName)
+        if not isinstance(root, MibObjectID) and idrName not in _known_oids:
+            warnings.warn(f'cant resolve identifier {idrName}')
+            return []
+
+        # (module which defines the name, name). like resolving, the first definition of a name is taken
+        subtree: list[tuple[Optional[MibModule], str]] = []
+        seen: set[str] = set()
+        stack = [(root.module if root else None, idrName)]
+        while stack:
+            module, name = stack.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            subtree.append((module, name))
+            stack.extend(reversed(self.corpus.children(module, name)))
+        self.resolve([(module, name, MibObjectID) for module, name in subtree[1:]])
+        return [name for module, name in subtree]
 
     def require_identifiers(self, idrs: dict[str, str]):
-        """ requiring recursively identifiers (oid(lowercase first letter) or type(capital first letter)) """
+        """ requiring identifiers (oid(lowercase first letter) or type(capital first letter)) and their dependencies """
+        idrs = {idr: path for idr, path in idrs.items() if idr not in self.parsed_identifiers}
+        self.corpus.prefetch_files(idrs.values())
+        requests = []
         for idr, path in idrs.items():
-            if idr in self.parsed_identifiers:
-                return
             if path not in self.modules:
-                self.modules[path] = MibModule(self, path)
-            self.modules[path].resolve_identifier(idr)
+                self.modules[path] = self.corpus.get_module(path)
+            requests.append((self.modules[path], idr, None))
+        self.resolve(requests)
 
-    def load_mibs_fast_load(self, mibFiles):
-        """ fast loading algorithm but slower searching time
-       choose this if you have a lot of mib files and small amount of oids"""
-        for file in mibFiles:
-            with open(file) as f:
-                self.loaded_text_mibs[file] = f.read()
-
-        # if idrName in self.parsed_identifiers:
-        #     return self.parsed_identifiers[idrName].module.name
-        #
-        # for mibPath, mibModule in self.loaded_mibs.items():
-        #     if idrName in mibModule.defined_idrs:
-        #         mibModule.resolve_identifier(idrName)
-
-    def load_mibs_fast_search(self, mibFiles):
-        """ fast searching algorithm but slower loading time
-        choose this if you have a lot of oids to search in small amount of mib files"""
-        for file in mibFiles:
-            # Note: MibModule(...) operation takes a lot of time for many files
-            self.loaded_parsed_mibs[file] = MibModule(self, file)
+    def resolve(self, requests: list[tuple[MibModule, str, Optional[type[MibIdr]]]]):
+        """
+        resolve identifiers and all their dependencies without recursion.
+        requests are (module, idrName, MibIdr class or None to choose by first letter of idrName).
 
-    def load_mibs(self, paths: list[pathType]):
+        first all the required definitions are found and parsed, visiting each module once for all the identifiers
+        pending in it. then the identifiers are registered by depth first walk with explicit stack: each identifier
+        followed by its dependencies in their order, the same order as resolving each dependency when it's found.
         """
-        load mib text files into dict
-        choosing best fastest to do so automatically.
-         """
-        mibFiles = []
-        for reg in paths:
-            mibFiles += glob(reg)
+        # latency of each identifier is measured from the start of the request (including its search, see
+        # require_identifier_list) until it's resolved with all its dependencies
+        start = self._request_start or time.perf_counter()
+        parse_times = self._discover(requests)
+        stats = self.corpus.stats
+        # (module, idrName, MibIdr class, depth)
+        stack = [(module, idrName, _IdrClass, 0) for module, idrName, _IdrClass in reversed(requests)]
+        while stack:
+            module, idrName, _IdrClass, depth = stack.pop()
+            if _IdrClass is _dependencies_resolved:
+                stats.identifier_resolved(idrName, time.perf_counter() - start, depth,
+                                          parse_times.get(self.parsed_identifiers[idrName], 0.0))
+                continue
+            if idrName in self.parsed_identifiers:
+                continue
+            if idrName in module.imported_idrs:
+                # defined by imported module
+                importedModule = module.required_module(module.imported_idrs[idrName])
+                if importedModule:
+                    stack.append((importedModule, idrName, None, depth))
+                continue
+            idr = module.find_definition(idrName, _IdrClass)
+            if not idr:
+                continue
+            self[idrName] = idr
+            if stats:
+                # reported after its dependencies
+                stack.append((module, idrName, _dependencies_resolved, depth))
+            stack.extend((module, name, _DepClass, depth + 1) for name, _DepClass in reversed(idr.requires))
+
+    def _discover(self, requests: list[tuple[MibModule, str, Optional[type[MibIdr]]]]) -> dict[MibIdr, float]:
+        """
+        parse definitions of all identifiers required by requests and their dependencies.
+        pending identifiers are grouped by module, so a module is visited once for all of them.
+        return {MibIdr:parsing seconds} of definitions parsed now (only when collecting stats)
+        """
+        stats = self.corpus.stats
+        parse_times: dict[MibIdr, float] = {}
+        # {module:[idrName]} and all (module, idrName) ever pending
+        pending: dict[MibModule, list[str]] = {}
+        seen: set[tuple[MibModule, str]] = set()
+
+        def add(module: MibModule, idrName: str):
+            if idrName not in self.parsed_identifiers and (module, idrName) not in seen:
+                seen.add((module, idrName))
+                pending.setdefault(module, []).append(idrName)
+
+        for module, idrName, _IdrClass in requests:
+            add(module, idrName)
+        while pending:
+            module = next(iter(pending))
+            idrNames = pending.pop(module)
+            self.corpus.prefetch_imports(module, idrNames)
+            for idrName in idrNames:
+                if idrName in module.imported_idrs:
+                    importedModule = module.required_module(module.imported_idrs[idrName])
+                    if importedModule:
+                        add(importedModule, idrName)
+                    continue
+                if stats and idrName not in module.parsed_idrs:
+                    start = time.perf_counter()
+                    idr = module.parse_identifier(idrName)
+                    parse_times[idr] = time.perf_counter() - start
+                else:
+                    idr = module.parse_identifier(idrName)
+                if idr:
+                    for name, _DepClass in idr.requires:
+                        add(module, name)
+        return parse_times
+
+    def _rebuild(self, previous: BuildManifest, idrs_dict: dict[str, str], idrs_list: list[str],
+                 mibs_paths: list[pathType]):
+        """
+        build the requested identifiers in the same order as a clean build. identifiers of previous build whose
+        files didn't change are built from its record, the others are resolved.
+        """
+        hashes: dict[str, str] = {}
+        signature: list[list] = []
+
+        def content_hash(path: str) -> str:
+            if path not in hashes:
+                hashes[path] = self.corpus.content_hash(path)
+            return hashes[path]
+
+        def corpus() -> list[list]:
+            if not signature:
+                signature.append(corpus_signature(mibs_paths))
+            return signature[0]
+
+        requests = [*idrs_dict.items(), *((idrName, None) for idrName in idrs_list)]
+        for idrName, path in requests:
+            if idrName in self.parsed_identifiers:
+                continue
+            request = previous.request(idrName, path)
+            if request and previous.is_reusable(request, content_hash, corpus, self.corpus.fast_load):
+                self.reused += 1
+                for defPath, name in previous.walk(request['root'], self.parsed_identifiers.__contains__):
+                    self[name] = self.corpus.get_module(defPath).parse_identifier(name)
+            elif path is not None:
+                self.require_identifiers({idrName: path})
+            else:
+                # already loaded mibs are not loaded again
+                self.load_mibs(mibs_paths)
+                self.require_identifier_list([idrName])
+        logger.info(f'reused {self.reused} of {len(requests)} requested identifiers from previous build')
 
-        # TODO: add smart automatically choosing algorithm
-        # if len(self.required_idrs)>len(mibFiles):
-        # self.fast_load = True
+    def dependencies(self, idr: MibIdr) -> dict[str, Optional[MibIdr]]:
+        """ {parent name:definition it is resolved to in this build (None if it isn't resolved)} of idr """
+        return {name: self.parsed_identifiers.get(name) for name in idr.dependencies}
 
-        if self.fast_load:
-            print('using fast loading algorithm')
-            self.load_mibs_fast_load(mibFiles)
-        else:
-            print('using fast searching algorithm')
-            self.load_mibs_fast_search(mibFiles)
+    def oid_tree(self) -> OidTree:
+        """ numeric oid tree of the object identifiers of this build """
+        return build_oid_tree((idr.module, name) for name, idr in self.parsed_identifiers.items()
+                              if isinstance(idr, MibObjectID))
 
-    def eject_mib(self, path=None):
-        mib_text = f'{self.mainModuleName} DEFINITIONS ::= BEGIN\n\n\n'
+    def load_mibs(self, paths: list[pathType]):
+        """ load mib files into the corpus. see MibCorpus.load_mibs """
+        self.corpus.load_mibs(paths)
+
+    def iter_mib(self) -> Iterator[str]:
+        """ generate the text of the built module piece by piece, definitions in resolving order """
+        yield f'{self.mainModuleName} DEFINITIONS ::= BEGIN\n\n\n'
+        if not self.emit_base:
+            # {moduleName:[idrName]} of base definitions which are imported instead of defined
+            imports: dict[str, list[str]] = {}
+            for name, oid in self.parsed_identifiers.items():
+                if oid and oid.module.base:
+                    imports.setdefault(oid.module.name, []).append(name)
+            if imports:
+                froms = '\n'.join(f'    {", ".join(names)}\n        FROM {moduleName}'
+                                  for moduleName, names in imports.items())
+                yield f'IMPORTS\n{froms};\n\n\n'
         for oid in self.parsed_identifiers.values():
-            if oid:
-                mib_text += oid.text + '\n\n'
-        mib_text += '\n\n\nEND'
+            if oid and (self.emit_base or not oid.module.base):
+                yield oid.text + '\n\n'
+        yield '\n\n\nEND'
 
-        if path:
-            p = f'{os.path.dirname(__file__)}/tests/{self.mainModuleName}.my'
-            print(f'saving {self.mainModuleName} to {p}')
-            with open(p, 'w') as f:
-                f.write(mib_text)
+    def write_mib(self, dest: Union[pathType, TextIO]):
+        """
+        stream the built module into dest without building the whole text in memory.
+        :param dest: writable text file object or file path. if directory path is given the module is written into
+        '<dest>/<mainModuleName>.my'
+        """
+        self._write(dest, self.iter_mib())
 
-        return mib_text
+    def _write(self, dest: Union[pathType, TextIO], pieces: Iterable[str]):
+        """ write pieces of the module text into dest, see write_mib """
+        if hasattr(dest, 'write'):
+            dest.writelines(pieces)
+            return
+        if os.path.isdir(dest):
+            dest = os.path.join(dest, f'{self.mainModuleName}.my')
+        logger.info(f'saving {self.mainModuleName} to {dest}')
+        with open(dest, 'w') as f:
+            f.writelines(pieces)
+
+    def eject_mib(self, path: pathType = None) -> str:
+        """ text of the built module. if path is given the same text is also written to path (see write_mib) """
+        text = ''.join(self.iter_mib())
+        if path:
+            self._write(path, (text,))
+        return text
 
     def __contains__(self, key):
         return key in self.parsed_identifiers
@@ -460,7 +1393,7 @@ def test_dict():
         "dot1xPaeSystemAuthControl": f"tests/IEEE8021-PAE-MIB-V1SMI.my",
     }
     mibParser = MibParser('test-dict-mib', idrs_dict=object_names_dirs)
-    mibParser.eject_mib('path')
+    mibParser.eject_mib('./tests')
 
 
 def test_list_with_loading():
@@ -480,11 +1413,16 @@ def test_list_with_loading():
 
 
 if __name__ == "__main__":
-    import time
+    if len(sys.argv) > 1:
+        # python -m MibParser build manifest.json, see MibBuild
+        from MibBuild import main
+        sys.exit(main())
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
 
     start_time = time.time()
 
     test_dict()
     test_list_with_loading()
 
-    print(f'execution time:{time.time() - start_time}')
+    logger.info(f'execution time:{time.time() - start_time}')
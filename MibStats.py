@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import Counter
+from typing import Callable
+
+logger = logging.getLogger('MibParser.stats')
+
+# hook(event, data). events: 'module_parsed', 'scan', 'hit', 'miss', 'identifier_resolved'
+Hook = Callable[[str, dict], None]
+
+
+class MibStats:
+    """
+    observer of MibParser building. pass it as MibParser(stats=MibStats()) to collect:
+     - parse time and bytes of each parsed module
+     - number of regex scans of each phase ('heads', 'module', 'identifier')
+     - hits and misses of each cache ('registry', 'index', 'index_files', 'scans', 'modules', 'identifiers')
+     - resolution latency of each identifier (wall time from the start of its request, including the search of a
+       requested identifier, until it's resolved with all its dependencies), parse time of its definition (0 if
+       already parsed by previous build) and dependency depth
+
+    every event is also logged to 'MibParser.stats' logger (debug level) and passed to the hooks.
+    when MibParser has no stats nothing is collected. builds of a shared corpus may report from many threads, so the
+    statistics are updated under a lock (hooks are called outside of it).
+    """
+
+    def __init__(self, hooks: list[Hook] = None):
+        self.hooks: list[Hook] = list(hooks or [])
+        # {moduleName:(seconds, bytes)}
+        self.modules: dict[str, tuple[float, int]] = {}
+        # {phase:scans count}
+        self.scans: Counter[str] = Counter()
+        # {cache:count}
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+        # {idrName:(seconds, depth)}. depth is 0 for required identifiers and +1 for each dependency level
+        self.identifiers: dict[str, tuple[float, int]] = {}
+        # {idrName:seconds} parsing of the definition only
+        self.parse_times: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: Hook):
+        self.hooks.append(hook)
+
+    def _emit(self, event: str, data: dict):
+        logger.debug('%s %s', event, data)
+        for hook in self.hooks:
+            hook(event, data)
+
+    def module_parsed(self, name: str, seconds: float, size: int):
+        with self._lock:
+            self.modules[name] = (seconds, size)
+        self._emit('module_parsed', {'module': name, 'seconds': seconds, 'bytes': size})
+
+    def scan(self, phase: str):
+        with self._lock:
+            self.scans[phase] += 1
+        self._emit('scan', {'phase': phase})
+
+    def hit(self, cache: str):
+        with self._lock:
+            self.hits[cache] += 1
+        self._emit('hit', {'cache': cache})
+
+    def miss(self, cache: str):
+        with self._lock:
+            self.misses[cache] += 1
+        self._emit('miss', {'cache': cache})
+
+    def identifier_resolved(self, name: str, seconds: float, depth: int, parse_seconds: float = 0.0):
+        with self._lock:
+            self.identifiers[name] = (seconds, depth)
+            self.parse_times[name] = parse_seconds
+        self._emit('identifier_resolved', {'identifier': name, 'seconds': seconds, 'depth': depth,
+                                           'parse_seconds': parse_seconds})
+
+    def as_dict(self) -> dict:
+        """ all statistics as json serializable dict """
+        return {
+            'modules': {name: {'seconds': seconds, 'bytes': size} for name, (seconds, size) in self.modules.items()},
+            'scans': dict(self.scans),
+            'hits': dict(self.hits),
+            'misses': dict(self.misses),
+            'identifiers': {name: {'seconds': seconds, 'depth': depth, 'parse_seconds': self.parse_times.get(name, 0.0)}
+                            for name, (seconds, depth) in self.identifiers.items()},
+        }
+
+    def log_summary(self, level=logging.INFO):
+        logger.log(level, 'parsed %d modules (%d bytes) in %.3fs, resolved %d identifiers, scans %s, hits %s, '
+                          'misses %s', len(self.modules), sum(size for seconds, size in self.modules.values()),
+                   sum(seconds for seconds, size in self.modules.values()), len(self.identifiers), dict(self.scans),
+                   dict(self.hits), dict(self.misses))
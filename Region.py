@@ -1,5 +1,19 @@
+from __future__ import annotations
+
 import re
-from typing import Optional, Match
+from functools import lru_cache
+from typing import Optional, Match, Pattern, Union
+
+patternType = Union[str, Pattern]
+
+# bounded cache of compiled patterns given as strings
+_compile = lru_cache(maxsize=256)(re.compile)
+_r_all = re.compile(r'[\s\S]*')
+
+
+def compile_pattern(reg: patternType) -> Pattern:
+    """ compiled pattern of reg. strings are compiled once using a bounded cache """
+    return reg if isinstance(reg, re.Pattern) else _compile(reg)
 
 
 class Region:
@@ -11,24 +25,37 @@ class Region:
     when searching will always search within the match boundaries.
     (from original text without recreating the string)
 
+    a region is a light view: it only references the text and holds its boundaries and match.
+    patterns can be given precompiled or as strings (compiled once and cached).
     """
 
-    # TODO: i'm not sure: text is being copied each time a Region instance is created?
+    __slots__ = ('text', 'region_reg', 'startBoundary', 'endBoundary', '_match')
 
-    def _update_match(self, regText: str = r'(.|\n)*', startBoundary=None, endBoundary=None):
+    def _update_match(self, reg: patternType = _r_all, startBoundary=None, endBoundary=None):
         self.startBoundary = startBoundary if startBoundary else 0
         self.endBoundary = endBoundary if endBoundary else len(self.text)
-        self._match: Optional[Match] = re.compile(regText).search(self.text, self.startBoundary, self.endBoundary)
+        self._match: Optional[Match] = compile_pattern(reg).search(self.text, self.startBoundary, self.endBoundary)
         if self._match:
             self.startBoundary = self._match.start()
             self.endBoundary = self._match.end()
 
-    def __init__(self, text, regText=r'(.|\n)*', startBoundary=None, endBoundary=None):
+    def __init__(self, text, regText: patternType = _r_all, startBoundary=None, endBoundary=None):
         self.text = text
         self.region_reg = regText
         self._update_match(regText, startBoundary, endBoundary)
 
-    def search(self, reg=r'(.|\n)*', startBoundary=None, endBoundary=None):
+    @classmethod
+    def from_match(cls, text, match: Match, reg: patternType = None) -> Region:
+        """ region of an existing match on text (no searching) """
+        region = cls.__new__(cls)
+        region.text = text
+        region.region_reg = reg if reg is not None else match.re
+        region.startBoundary = match.start()
+        region.endBoundary = match.end()
+        region._match = match
+        return region
+
+    def search(self, reg: patternType = _r_all, startBoundary=None, endBoundary=None):
         """ search within region """
         if not self:
             return
@@ -38,18 +65,19 @@ class Region:
             endBoundary = self.endBoundary
         return Region(self.text, reg, startBoundary, endBoundary)
 
-    def narrow(self, reg):
+    def narrow(self, reg: patternType):
         """ narrow boundaries and search within boundaries """
         if not self:
             return
         self._update_match(reg, self.startBoundary, self.endBoundary)
         return self
 
-    def finditer(self, regText):
-        m = self.search(regText)
-        while m:
-            yield m
-            m = self.search(regText, m.end())
+    def finditer(self, reg: patternType):
+        """ iterate over all matches within region """
+        if not self:
+            return
+        for m in compile_pattern(reg).finditer(self.text, self.startBoundary, self.endBoundary):
+            yield Region.from_match(self.text, m, reg)
 
     def start(self):
         return self._match.start()
@@ -0,0 +1,126 @@
+"""
+deterministic generator of synthetic SMI corpora for benchmarks.
+
+module 0 ('BENCH-SMI') defines the root of the tree and a base type. every other module imports from its parent
+module, so each module starts a chain of imports 'depth' modules long. each module defines one subtree, one type and
+'definitions' objects with DESCRIPTION of 'description_size' chars. with 'long_comments' every definition is preceded
+by a long comment (pathological case for searching definition heads).
+
+run from the repository root: python -m benchmarks.corpus out-dir [modules] [definitions]
+"""
+from __future__ import annotations
+
+import os
+import random
+import sys
+from dataclasses import dataclass, asdict
+
+_words = ('counter', 'packets', 'octets', 'errors', 'value', 'interface', 'port', 'status', 'table', 'entry', 'the',
+          'number', 'of', 'received', 'sent', 'since', 'last', 'reset')
+
+
+@dataclass
+class CorpusSpec:
+    modules: int = 200
+    depth: int = 4
+    definitions: int = 50
+    description_size: int = 200
+    long_comments: bool = False
+    seed: int = 0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def module_name(i: int) -> str:
+    return f'BENCH-MIB-{i}' if i else 'BENCH-SMI'
+
+
+def parent_module(i: int, depth: int) -> int:
+    """ index of the module which module i imports from """
+    return i - 1 if (i - 1) % depth else 0
+
+
+def object_name(i: int, j: int) -> str:
+    return f'bench{i}Object{j}'
+
+
+def _description(rnd: random.Random, size: int) -> str:
+    text = []
+    length = 0
+    while length < size:
+        word = rnd.choice(_words)
+        text.append(word)
+        length += len(word) + 1
+    lines = [' '.join(text[k:k + 10]) for k in range(0, len(text), 10)]
+    return '\n            '.join(lines)
+
+
+def _comment(rnd: random.Random) -> str:
+    return ''.join(f'-- {" ".join(rnd.choices(_words, k=15))} ::= {{ ignored }} OBJECT-TYPE\n' for _ in range(20))
+
+
+def base_module() -> str:
+    return '''BENCH-SMI DEFINITIONS ::= BEGIN
+
+benchRoot OBJECT IDENTIFIER ::= { iso 3 6 1 4 1 99999 }
+
+BenchCounter ::= [APPLICATION 1] IMPLICIT INTEGER (0..4294967295)
+
+END
+'''
+
+
+def module_text(i: int, spec: CorpusSpec) -> str:
+    rnd = random.Random(f'{spec.seed}-{i}')
+    parent = parent_module(i, spec.depth)
+    parent_root = f'bench{parent}' if parent else 'benchRoot'
+    parent_type = f'Bench{parent}Type' if parent else 'BenchCounter'
+    out = [f'{module_name(i)} DEFINITIONS ::= BEGIN\n\n',
+           f'IMPORTS\n    {parent_root}, {parent_type}\n        FROM {module_name(parent)};\n\n',
+           f'bench{i} OBJECT IDENTIFIER ::= {{ {parent_root} {i} }}\n\n',
+           f'Bench{i}Type ::= {parent_type}\n\n']
+    for j in range(spec.definitions):
+        if spec.long_comments:
+            out.append(_comment(rnd))
+        syntax = rnd.choice((f'Bench{i}Type', parent_type, 'INTEGER'))
+        out.append(f'''{object_name(i, j)} OBJECT-TYPE
+    SYNTAX  {syntax}
+    ACCESS  read-only
+    STATUS  mandatory
+    DESCRIPTION
+            "{_description(rnd, spec.description_size)}"
+    ::= {{ bench{i} {j + 1} }}
+
+''')
+    out.append('END\n')
+    return ''.join(out)
+
+
+def generate_corpus(out_dir, spec: CorpusSpec = CorpusSpec()) -> list[str]:
+    """ write the corpus files ('<module name>.my') into out_dir and return their paths """
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for i in range(spec.modules):
+        path = os.path.join(out_dir, f'{module_name(i)}.my')
+        with open(path, 'w') as f:
+            f.write(module_text(i, spec) if i else base_module())
+        paths.append(path)
+    return paths
+
+
+def sample_definitions(spec: CorpusSpec, count: int) -> list[tuple[int, int]]:
+    """ deterministic sample of (module index, object index) of objects defined in the corpus """
+    rnd = random.Random(spec.seed)
+    return [(rnd.randrange(1, spec.modules), rnd.randrange(spec.definitions)) for _ in range(count)]
+
+
+def sample_identifiers(spec: CorpusSpec, count: int) -> list[str]:
+    """ deterministic sample of object names defined in the corpus """
+    return [object_name(i, j) for i, j in sample_definitions(spec, count)]
+
+
+if __name__ == "__main__":
+    out_dir, *args = sys.argv[1:]
+    spec = CorpusSpec(*map(int, args))
+    print(f'generated {len(generate_corpus(out_dir, spec))} modules in {out_dir}')
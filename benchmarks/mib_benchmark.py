@@ -0,0 +1,288 @@
+"""
+benchmarks of MibParser on a synthetic corpus (see benchmarks.corpus).
+
+    python -m benchmarks.mib_benchmark run [--out results.json] [--modules N] [--definitions N] ...
+    python -m benchmarks.mib_benchmark compare base.json new.json [--threshold 0.1]
+
+each benchmark is repeated and the best time is kept. compare prints the ratio of every benchmark and exits with
+status 1 if any benchmark is slower than the base by more than the threshold.
+
+run from the repository root.
+"""
+from __future__ import annotations
+
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from glob import glob
+from pathlib import Path
+from typing import Callable
+from unittest import mock
+
+import MibExport
+from MibParser import MibParser, MibCorpus, MibModule, FAST_LOAD, FAST_SEARCH, HYBRID
+from benchmarks.corpus import CorpusSpec, generate_corpus, sample_definitions, object_name
+
+# simulated latency of opening a file (like network file system) and io threads of prefetching benchmarks
+_open_latency = 0.002
+_io_workers = 8
+# threads serving build requests from a shared corpus in concurrent benchmarks
+_build_workers = 8
+
+# {benchmark name:function(corpus) -> seconds}
+benchmarks: dict[str, Callable[[Corpus], float]] = {}
+
+
+def benchmark(func):
+    benchmarks[func.__name__] = func
+    return func
+
+
+class Corpus:
+    """ generated corpus files and the identifiers required from them """
+
+    def __init__(self, directory, spec: CorpusSpec, identifiers: int):
+        self.spec = spec
+        self.paths = generate_corpus(directory, spec)
+        self.pattern = str(Path(directory) / '*.my')
+        definitions = sample_definitions(spec, identifiers)
+        self.identifiers = [object_name(i, j) for i, j in definitions]
+        # {identifier:path of module which defines it}
+        self.identifiers_paths = {object_name(i, j): self.paths[i] for i, j in definitions}
+
+
+@contextlib.contextmanager
+def quiet():
+    """ hide progress prints and warnings of the parser """
+    with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        yield
+
+
+def timed(func, *args) -> float:
+    start = time.perf_counter()
+    with quiet():
+        func(*args)
+    return time.perf_counter() - start
+
+
+def _slow_open(*args, **kwargs):
+    time.sleep(_open_latency)
+    return builtins.open(*args, **kwargs)
+
+
+def slow_files():
+    """ simulate latency of opening files by the parser """
+    return mock.patch('MibParser.open', _slow_open, create=True)
+
+
+def _parser(fast_load, io_workers: int = 1) -> MibParser:
+    with quiet():
+        return MibParser('bench-mib', fast_load=fast_load, io_workers=io_workers)
+
+
+def _loaded_parser(corpus: Corpus, fast_load, io_workers: int = 1) -> MibParser:
+    mibParser = _parser(fast_load, io_workers)
+    with quiet():
+        mibParser.load_mibs([corpus.pattern])
+    return mibParser
+
+
+@benchmark
+def load_mibs_fast_load(corpus: Corpus) -> float:
+    return timed(_parser(FAST_LOAD).load_mibs, [corpus.pattern])
+
+
+@benchmark
+def load_mibs_fast_search(corpus: Corpus) -> float:
+    return timed(_parser(FAST_SEARCH).load_mibs, [corpus.pattern])
+
+
+@benchmark
+def load_mibs_hybrid(corpus: Corpus) -> float:
+    return timed(_parser(HYBRID).load_mibs, [corpus.pattern])
+
+
+@benchmark
+def load_mibs_latency(corpus: Corpus) -> float:
+    with slow_files():
+        return timed(_parser(FAST_LOAD).load_mibs, [corpus.pattern])
+
+
+@benchmark
+def load_mibs_latency_prefetch(corpus: Corpus) -> float:
+    with slow_files():
+        return timed(_parser(FAST_LOAD, _io_workers).load_mibs, [corpus.pattern])
+
+
+@benchmark
+def require_identifier_list_latency(corpus: Corpus) -> float:
+    with slow_files():
+        mibParser = _parser(FAST_SEARCH)
+        return timed(lambda: mibParser.require_identifiers(corpus.identifiers_paths))
+
+
+@benchmark
+def require_identifier_list_latency_prefetch(corpus: Corpus) -> float:
+    with slow_files():
+        mibParser = _parser(FAST_SEARCH, _io_workers)
+        return timed(lambda: mibParser.require_identifiers(corpus.identifiers_paths))
+
+
+@benchmark
+def require_identifier_list_fast_load(corpus: Corpus) -> float:
+    return timed(_loaded_parser(corpus, FAST_LOAD).require_identifier_list, corpus.identifiers)
+
+
+@benchmark
+def require_identifier_list_fast_search(corpus: Corpus) -> float:
+    return timed(_loaded_parser(corpus, FAST_SEARCH).require_identifier_list, corpus.identifiers)
+
+
+@benchmark
+def require_identifier_list_hybrid(corpus: Corpus) -> float:
+    return timed(_loaded_parser(corpus, HYBRID).require_identifier_list, corpus.identifiers)
+
+
+@benchmark
+def require_subtree(corpus: Corpus) -> float:
+    """ the subtree of the first chain of imports (see benchmarks.corpus) """
+    return timed(_loaded_parser(corpus, HYBRID).require_subtree, 'bench1')
+
+
+@benchmark
+def mib_module(corpus: Corpus) -> float:
+    mibCorpus = _parser(FAST_LOAD).corpus
+    return timed(lambda: [MibModule(mibCorpus, path) for path in corpus.paths])
+
+
+@benchmark
+def eject_mib(corpus: Corpus) -> float:
+    mibParser = _loaded_parser(corpus, FAST_SEARCH)
+    with quiet():
+        mibParser.require_identifier_list(corpus.identifiers)
+    return timed(mibParser.eject_mib)
+
+
+@benchmark
+def corpus_build(corpus: Corpus) -> float:
+    """ build from a warm corpus which already resolved the identifiers for another build """
+    with quiet():
+        mibCorpus = MibCorpus([corpus.pattern], fast_load=HYBRID)
+        mibCorpus.build('warm-mib', corpus.identifiers)
+    return timed(mibCorpus.build, 'bench-mib', corpus.identifiers)
+
+
+@benchmark
+def export_definitions(corpus: Corpus) -> float:
+    """ JSON Lines export of all the definitions of the corpus """
+    with open(os.devnull, 'w') as f:
+        return timed(MibExport.export, corpus.pattern, f)
+
+
+def _concurrent_builds(corpus: Corpus, workers: int) -> float:
+    """ a build request of each identifier (like a service building mibs on demand) from a shared corpus, served by a
+    pool of threads. modules are parsed on first request and the files are slow to open """
+    with slow_files():
+        mibCorpus = MibCorpus(fast_load=FAST_LOAD)
+        requests = list(corpus.identifiers_paths.items())
+        with ThreadPoolExecutor(workers) as executor:
+            return timed(lambda: list(executor.map(
+                lambda request: mibCorpus.build(f'{request[0]}-mib', idrs_dict=dict([request])), requests)))
+
+
+@benchmark
+def concurrent_builds(corpus: Corpus) -> float:
+    return _concurrent_builds(corpus, 1)
+
+
+@benchmark
+def concurrent_builds_threads(corpus: Corpus) -> float:
+    return _concurrent_builds(corpus, _build_workers)
+
+
+def run(spec: CorpusSpec, identifiers: int, repeat: int, names: list[str] = None) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = Corpus(directory, spec, identifiers)
+        size = sum(Path(path).stat().st_size for path in glob(corpus.pattern))
+        print(f'corpus of {spec.modules} modules ({size} bytes), {identifiers} identifiers')
+        for name in names or benchmarks:
+            seconds = min(benchmarks[name](corpus) for _ in range(repeat))
+            results[name] = {'seconds': seconds}
+            print(f'{name:40} {seconds * 1e3:10.2f} ms')
+    return {
+        'python': platform.python_version(),
+        'corpus': {**spec.as_dict(), 'bytes': size},
+        'identifiers': identifiers,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def compare(base: dict, new: dict, threshold: float) -> list[str]:
+    """ print ratio new/base of each benchmark and return names of regressed benchmarks """
+    regressions = []
+    for name, result in new['results'].items():
+        if name not in base['results']:
+            print(f'{name:40} {"new":>10}')
+            continue
+        ratio = result['seconds'] / base['results'][name]['seconds']
+        regressed = ratio > 1 + threshold
+        if regressed:
+            regressions.append(name)
+        print(f'{name:40} {ratio:10.2f}x{"  REGRESSION" if regressed else ""}')
+    return regressions
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.mib_benchmark')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help='run benchmarks and save results as json')
+    run_parser.add_argument('--out', help='results json file')
+    run_parser.add_argument('--identifiers', type=int, default=20)
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--benchmark', action='append', choices=list(benchmarks), dest='names')
+    for field, default in CorpusSpec().as_dict().items():
+        option = f'--{field.replace("_", "-")}'
+        if type(default) == bool:
+            run_parser.add_argument(option, action='store_true', dest=field)
+        else:
+            run_parser.add_argument(option, type=type(default), default=default, dest=field)
+    compare_parser = commands.add_parser('compare', help='compare results and flag regressions')
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help='allowed slowdown ratio (default 0.1 = 10%%)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        spec = CorpusSpec(**{field: getattr(args, field) for field in CorpusSpec().as_dict()})
+        results = run(spec, args.identifiers, args.repeat, args.names)
+        if args.out:
+            with open(args.out, 'w') as f:
+                json.dump(results, f, indent=2)
+        return 0
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    regressions = compare(base, new, args.threshold)
+    if regressions:
+        print(f'{len(regressions)} regressions')
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
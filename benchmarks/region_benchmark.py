@@ -0,0 +1,95 @@
+"""
+micro-benchmark of Region: time and retained memory per definition when iterating all definitions of a big text.
+
+compares the legacy Region (pattern compiled on every search, finditer re-searching and building a full
+object per hit) with the current Region (slots view over precompiled pattern driven by Pattern.finditer).
+
+run from the repository root: python -m benchmarks.region_benchmark [definitions-count]
+"""
+import re
+import sys
+import time
+import tracemalloc
+
+from Region import Region
+
+# whole definitions (regex cost dominates) and definition heads only (region cost dominates)
+_def_reg = r'[\w-]+\s*OBJECT(-TYPE| IDENTIFIER)(.|\n)*?::=\s*\{.*?\}'
+_head_reg = r'(?m)^[\w-]+(?= OBJECT-TYPE)'
+
+
+class LegacyRegion:
+    """ Region implementation before the slots/precompiled patterns redesign """
+
+    def _update_match(self, regText=r'(.|\n)*', startBoundary=None, endBoundary=None):
+        self.startBoundary = startBoundary if startBoundary else 0
+        self.endBoundary = endBoundary if endBoundary else len(self.text)
+        self._match = re.compile(regText).search(self.text, self.startBoundary, self.endBoundary)
+        if self._match:
+            self.startBoundary = self._match.start()
+            self.endBoundary = self._match.end()
+
+    def __init__(self, text, regText=r'(.|\n)*', startBoundary=None, endBoundary=None):
+        self.text = text
+        self.region_reg = regText
+        self._update_match(regText, startBoundary, endBoundary)
+
+    def search(self, reg=r'(.|\n)*', startBoundary=None, endBoundary=None):
+        if not self:
+            return
+        if startBoundary is None:
+            startBoundary = self.startBoundary
+        if endBoundary is None:
+            endBoundary = self.endBoundary
+        return LegacyRegion(self.text, reg, startBoundary, endBoundary)
+
+    def finditer(self, regText):
+        m = self.search(regText)
+        while m:
+            yield m
+            m = self.search(regText, m.end())
+
+    def end(self):
+        return self._match.end()
+
+    def __bool__(self):
+        return True if self._match else False
+
+
+def make_text(n: int) -> str:
+    return ''.join(f'''
+obj{i} OBJECT-TYPE
+    SYNTAX INTEGER
+    ACCESS read-only
+    STATUS mandatory
+    DESCRIPTION
+        "object number {i}."
+    ::= {{ parent {i} }}
+''' for i in range(n))
+
+
+def measure(name, region, reg, n):
+    start = time.perf_counter()
+    count = sum(1 for _ in region.finditer(reg))
+    elapsed = time.perf_counter() - start
+    assert count == n, count
+
+    tracemalloc.start()
+    hits = list(region.finditer(reg))
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del hits
+    print(f'{name:8} {elapsed / n * 1e6:8.2f} us/definition {retained / n:8.0f} B/definition retained')
+
+
+def main(n: int = 5000):
+    text = make_text(n)
+    print(f'iterating {n} definitions ({len(text)} chars)')
+    for name, reg in (('definitions', _def_reg), ('heads', _head_reg)):
+        print(name)
+        measure('before', LegacyRegion(text), reg, n)
+        measure('after', Region(text), re.compile(reg), n)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,109 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+from pathlib import Path
+
+from MibBuild import Manifest, build, main
+from MibParser import MibParser
+
+root = Path(__file__).resolve().parent
+targets = [{'name': 'system-mib', 'idrs_list': ['sysObjectID', 'sysDescr']},
+           {'name': 'bad-mib', 'idrs_list': ['sysObjectID', 'noSuchName']},
+           {'name': 'pae-mib', 'idrs_dict': {'dot1xPaeSystemAuthControl': 'tests/IEEE8021-PAE-MIB-V1SMI.my'}}]
+
+
+class MibBuildTest(unittest.TestCase):
+    def setUp(self):
+        self._cwd = os.getcwd()
+        os.chdir(root)
+        self.tmp = tempfile.mkdtemp()
+        self._warnings = warnings.catch_warnings()
+        self._warnings.__enter__()
+        warnings.simplefilter('ignore')
+
+    def tearDown(self):
+        self._warnings.__exit__(None, None, None)
+        os.chdir(self._cwd)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def manifest(self, data: dict) -> str:
+        path = os.path.join(self.tmp, 'manifest.json')
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        return path
+
+    def run_main(self, *args: str) -> tuple[int, str, str]:
+        """ exit status, stdout and stderr of the command """
+        out, err = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try:
+                status = main(list(args))
+            except SystemExit as e:
+                status = e.code
+        return status, out.getvalue(), err.getvalue()
+
+    def test_build(self):
+        out_dir = os.path.join(self.tmp, 'out')
+        report = os.path.join(self.tmp, 'report.json')
+        manifest = self.manifest({'mibs_paths': ['tests/*'], 'out_dir': out_dir, 'targets': targets[::2]})
+        status, out, err = self.run_main('build', manifest, '--report', report, '--verify')
+        self.assertEqual(status, 0, err)
+        self.assertIn('built 2 modules', out)
+        expected = MibParser('system-mib', idrs_list=['sysObjectID', 'sysDescr'], mibs_paths=['tests/*']).eject_mib()
+        with open(os.path.join(out_dir, 'system-mib.my')) as f:
+            self.assertEqual(f.read(), expected)
+        with open(report) as f:
+            results = json.load(f)['targets']
+        self.assertEqual([(result['name'], result['verified'], result['error']) for result in results],
+                         [('system-mib', True, None), ('pae-mib', True, None)])
+
+    def test_failed_target(self):
+        out_dir = os.path.join(self.tmp, 'out')
+        failing = [{'name': 'missing-file-mib', 'idrs_dict': {'sysObjectID': 'tests/NO-MIB.my'}},
+                   {'name': 'missing-name-mib', 'idrs_dict': {'noSuchName': 'tests/RFC1213-MIB.my'}}]
+        data = {'mibs_paths': ['tests/*'], 'out_dir': out_dir, 'targets': targets + failing}
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs):
+                results = build(Manifest.load(self.manifest(data)), jobs)
+                errors = {result.name: result.error for result in results}
+                self.assertEqual(errors['bad-mib'], 'identifier noSuchName not found in the loaded mibs')
+                self.assertIn('NO-MIB.my', errors['missing-file-mib'])
+                self.assertEqual(errors['missing-name-mib'],
+                                 'identifier noSuchName not found in tests/RFC1213-MIB.my')
+                # the other targets are built
+                self.assertIsNone(errors['system-mib'])
+                self.assertIsNone(errors['pae-mib'])
+                self.assertEqual(sorted(os.listdir(out_dir)), ['pae-mib.my', 'system-mib.my'])
+
+        status, out, err = self.run_main('build', self.manifest(data))
+        self.assertEqual(status, 1)
+        self.assertIn('bad-mib', out)
+        self.assertIn('FAILED: identifier noSuchName not found', out)
+        self.assertIn('3 modules failed', out)
+
+    def test_manifest_errors(self):
+        for data, message in (({'targets': [{'name': 'a', 'idrs': []}]}, "unknown field 'idrs' in target 0"),
+                              ({'mibs_paths': []}, "missing field 'targets' in manifest"),
+                              ([], 'manifest must be a json object')):
+            with self.subTest(message=message):
+                status, out, err = self.run_main('build', self.manifest(data))
+                self.assertEqual(status, 2)
+                self.assertIn(message, err)
+
+        path = os.path.join(self.tmp, 'broken.json')
+        with open(path, 'w') as f:
+            f.write('{"targets": ')
+        for path in (path, os.path.join(self.tmp, 'missing.json'), self.tmp):
+            with self.subTest(path=path):
+                status, out, err = self.run_main('build', path)
+                self.assertEqual(status, 2)
+                self.assertIn(path, err)
+
+
+if __name__ == '__main__':
+    unittest.main()
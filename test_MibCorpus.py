@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from MibParser import MibParser, MibCorpus, FAST_LOAD, FAST_SEARCH, HYBRID
+
+root = Path(__file__).resolve().parent
+targets = [['sysObjectID'], ['ifIndex', 'TimeTicks'], ['frxT1OutOctets', 'frxH6EsTx'], ['dot1xPaeSystemAuthControl'],
+           ['ifIndex', 'frxPort', 'sysObjectID'], ['dot1xPaeSystem', 'TimeTicks']]
+
+
+class MibCorpusTest(unittest.TestCase):
+    def setUp(self):
+        self._cwd = os.getcwd()
+        os.chdir(root)
+        self.tmp = tempfile.mkdtemp()
+        self._warnings = warnings.catch_warnings()
+        self._warnings.__enter__()
+        warnings.simplefilter('ignore')
+
+    def tearDown(self):
+        self._warnings.__exit__(None, None, None)
+        os.chdir(self._cwd)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def write(self, name: str, text: str) -> str:
+        path = os.path.join(self.tmp, name)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def test_dependency_links_per_build(self):
+        # base is defined by both files, leaf depends on base
+        x = self.write('X.my', 'X-MIB DEFINITIONS ::= BEGIN\n\nbase OBJECT IDENTIFIER ::= { iso 5 }\n\nEND\n')
+        y = self.write('Y.my', 'Y-MIB DEFINITIONS ::= BEGIN\n\nbase OBJECT IDENTIFIER ::= { iso 7 }\n\n'
+                               'leaf OBJECT IDENTIFIER ::= { base 1 }\n\nEND\n')
+        corpus = MibCorpus()
+        first = corpus.build('first', idrs_dict={'base': x, 'leaf': y})
+        second = corpus.build('second', idrs_dict={'leaf': y})
+        leaf = first['leaf']
+        # the definition is shared, the links are of each build
+        self.assertIs(second['leaf'], leaf)
+        self.assertEqual(leaf.dependencies, ('base',))
+        self.assertEqual(first.dependencies(leaf)['base'].module.path, Path(x))
+        self.assertEqual(second.dependencies(leaf)['base'].module.path, Path(y))
+
+    def test_concurrent_builds(self):
+        for fast_load in (FAST_LOAD, FAST_SEARCH, HYBRID):
+            with self.subTest(fast_load=fast_load):
+                serial = [MibParser(f'mib-{i}', idrs_list=idrs, mibs_paths=['tests/*'], fast_load=fast_load).eject_mib()
+                          for i, idrs in enumerate(targets)]
+                corpus = MibCorpus(['tests/*'], fast_load=fast_load)
+                with ThreadPoolExecutor(4) as executor:
+                    built = list(executor.map(lambda i: corpus.build(f'mib-{i}', targets[i]).eject_mib(),
+                                              [i for run in range(4) for i in range(len(targets))]))
+                self.assertEqual(built, serial * 4)
+
+    def test_mibs_dirs_of_corpus(self):
+        with self.assertRaisesRegex(ValueError, 'mibs_dirs'):
+            MibParser(corpus=MibCorpus(), mibs_dirs=['tests'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+from pathlib import Path
+
+from MibExport import export, iter_records, mib_files
+from MibParser import MibCorpus
+
+root = Path(__file__).resolve().parent
+source_mibs = ['RFC1155-SMI.my', 'RFC1213-MIB.my', 'CISCO-90-MIB-V1SMI.my', 'IEEE8021-PAE-MIB-V1SMI.my']
+
+
+class MibExportTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.mibs_dir = os.path.join(self.tmp, 'mibs')
+        os.makedirs(self.mibs_dir)
+        for name in source_mibs:
+            shutil.copy(root / 'tests' / name, self.mibs_dir)
+        self.mibs_paths = [os.path.join(self.mibs_dir, '*')]
+        self._warnings = warnings.catch_warnings()
+        self._warnings.__enter__()
+        warnings.simplefilter('ignore')
+
+    def tearDown(self):
+        self._warnings.__exit__(None, None, None)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_records(self):
+        records = {record['name']: record for record in iter_records([os.path.join(self.mibs_dir, 'RFC1213-MIB.my')])}
+        self.assertEqual(records['sysObjectID'], {'name': 'sysObjectID', 'module': 'RFC1213-MIB', 'kind': 'oid',
+                                                  'parent': 'system', 'sub_id': 2, 'syntax': 'OBJECT IDENTIFIER',
+                                                  'access': 'read-only', 'status': 'mandatory'})
+        self.assertEqual(records['mib-2'], {'name': 'mib-2', 'module': 'RFC1213-MIB', 'kind': 'oid', 'parent': 'mgmt',
+                                            'sub_id': 1, 'syntax': None, 'access': None, 'status': None})
+        self.assertEqual((records['DisplayString']['kind'], records['DisplayString']['syntax']),
+                         ('type', 'OCTET STRING'))
+        # records are in definition order
+        self.assertEqual(list(records)[:3], ['mib-2', 'DisplayString', 'PhysAddress'])
+
+    def test_export(self):
+        expected = list(iter_records(self.mibs_paths))
+        self.assertEqual(len({record['module'] for record in expected}), len(source_mibs))
+        path = os.path.join(self.tmp, 'definitions.jsonl')
+        self.assertEqual(export(self.mibs_paths, path), len(expected))
+        with open(path) as f:
+            self.assertEqual([json.loads(line) for line in f], expected)
+        for jobs in (1, 3):
+            with self.subTest(jobs=jobs):
+                out = io.StringIO()
+                export(self.mibs_paths, out, jobs)
+                with open(path) as f:
+                    self.assertEqual(out.getvalue(), f.read())
+
+    def test_files(self):
+        with open(os.path.join(self.mibs_dir, 'README.txt'), 'w') as f:
+            f.write('not a mib module\n')
+        files = mib_files([os.path.join(self.mibs_dir, 'RFC1213-MIB.my'), *self.mibs_paths])
+        # paths in the given order, each file once
+        self.assertEqual(files, [os.path.join(self.mibs_dir, name)
+                                 for name in ('RFC1213-MIB.my', 'CISCO-90-MIB-V1SMI.my', 'IEEE8021-PAE-MIB-V1SMI.my',
+                                              'README.txt', 'RFC1155-SMI.my')])
+        with self.assertLogs('MibParser.export', 'WARNING') as logs:
+            records = list(iter_records(files))
+        self.assertIn('skipping ' + files[3], logs.output[0])
+        self.assertEqual(list(dict.fromkeys(record['module'] for record in records)),
+                         ['RFC1213-MIB', 'Cisco90Series-MIB', 'IEEE8021-PAE-MIB', 'RFC1155-SMI'])
+        # the same definitions as the modules of a corpus
+        corpus = MibCorpus([os.path.join(self.mibs_dir, '*.my')], fast_load=False)
+        self.assertEqual(len(records), sum(len(module.defined_idrs) for module in corpus.loaded_parsed_mibs.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from MibIndex import MibIndex
+from MibParser import MibCorpus, MibParser, HYBRID
+
+root = Path(__file__).resolve().parent
+source_mibs = ['RFC1155-SMI.my', 'RFC1213-MIB.my', 'CISCO-90-MIB-V1SMI.my', 'IEEE8021-PAE-MIB-V1SMI.my']
+
+
+class MibIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.mibs_dir = os.path.join(self.tmp, 'mibs')
+        self.cache_dir = os.path.join(self.tmp, 'cache')
+        os.makedirs(self.mibs_dir)
+        for name in source_mibs:
+            shutil.copy(root / 'tests' / name, self.mibs_dir)
+        self.mibs_paths = [os.path.join(self.mibs_dir, '*')]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def mib(self, name: str) -> str:
+        return os.path.join(self.mibs_dir, name)
+
+    def test_lookup(self):
+        MibCorpus(self.mibs_paths, cache_dir=self.cache_dir).close()
+        index = MibIndex(self.cache_dir)
+        try:
+            self.assertEqual([(path, kind) for path, offset, kind in index.lookup('sysObjectID')],
+                             [(os.path.realpath(self.mib('RFC1213-MIB.my')), 'oid')])
+            self.assertEqual([kind for path, offset, kind in index.lookup('TimeTicks')], ['type'])
+            self.assertEqual(index.lookup('noSuchName'), [])
+            self.assertTrue(all(index.is_fresh(self.mib(name)) for name in source_mibs))
+        finally:
+            index.close()
+
+    def test_unknown_name_reads_no_file(self):
+        MibCorpus(self.mibs_paths, cache_dir=self.cache_dir).close()
+        for fast_load in (True, HYBRID):
+            with self.subTest(fast_load=fast_load):
+                corpus = MibCorpus(self.mibs_paths, fast_load=fast_load, cache_dir=self.cache_dir)
+                try:
+                    self.assertEqual(corpus._search_identifiers(['noSuchName']), {'noSuchName': []})
+                    MibParser(corpus=corpus)._get_mib_from_identifier('noSuchName')
+                    self.assertEqual([text for text in corpus.loaded_text_mibs.values() if text is not None], [])
+                    self.assertEqual(corpus._loaded_scans, {})
+                finally:
+                    corpus.close()
+
+    def test_changed_file_is_indexed_again(self):
+        MibCorpus(self.mibs_paths, cache_dir=self.cache_dir).close()
+        path = self.mib('RFC1213-MIB.my')
+        with open(path) as f:
+            text = f.read()
+        with open(path, 'w') as f:
+            f.write(text.replace('sysObjectID', 'sysRenamedID'))
+        index = MibIndex(self.cache_dir)
+        try:
+            self.assertFalse(index.is_fresh(path))
+        finally:
+            index.close()
+
+        corpus = MibCorpus(self.mibs_paths, cache_dir=self.cache_dir)
+        try:
+            self.assertEqual(corpus._search_identifiers(['sysObjectID', 'sysRenamedID']),
+                             {'sysObjectID': [], 'sysRenamedID': [path]})
+            self.assertTrue(corpus.index.is_fresh(path))
+        finally:
+            corpus.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+from pathlib import Path
+
+from MibLocator import MibLocator, read_module_name
+from MibParser import MibParser
+
+root = Path(__file__).resolve().parent
+
+
+def module_text(name: str, body: str = '') -> str:
+    return f'{name} DEFINITIONS ::= BEGIN\n\n{body}\nEND\n'
+
+
+class MibLocatorTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def write(self, relative: str, text: str) -> str:
+        path = os.path.join(self.tmp, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def test_find_by_file_name(self):
+        path = self.write('a/FOO-MIB.my', module_text('FOO-MIB'))
+        locator = MibLocator([os.path.join(self.tmp, 'a')])
+        self.assertEqual(locator.find('FOO-MIB'), path)
+        self.assertIsNone(locator.find('BAR-MIB'))
+
+    def test_find_by_header(self):
+        path = self.write('a/rfc-foo.txt', module_text('FOO-MIB'))
+        # header after the first read of the file
+        long = self.write('a/long.mib', '-- ' + 'x' * 5000 + '\n' + module_text('LONG-MIB'))
+        locator = MibLocator([os.path.join(self.tmp, 'a')])
+        self.assertEqual(locator.find('FOO-MIB'), path)
+        self.assertEqual(locator.find('LONG-MIB'), long)
+        self.assertEqual(read_module_name(long), 'LONG-MIB')
+        self.assertIsNone(read_module_name(self.write('a/empty.my', '-- no module\n')))
+
+    def test_directory_order(self):
+        first = self.write('first/FOO-MIB.my', module_text('FOO-MIB'))
+        second = self.write('second/FOO-MIB.my', module_text('FOO-MIB'))
+        importing = self.write('importing/foo.my', module_text('FOO-MIB'))
+        locator = MibLocator([os.path.join(self.tmp, 'first'), os.path.join(self.tmp, 'second')])
+        self.assertEqual(locator.find('FOO-MIB'), first)
+        # directory of the importing module is searched first
+        self.assertEqual(locator.find('FOO-MIB', os.path.join(self.tmp, 'importing')), importing)
+        self.assertEqual(locator.find_in(os.path.join(self.tmp, 'second'), 'FOO-MIB'), second)
+        # in a directory a file named by the module is taken before the headers of the other files
+        self.write('second/a-copy.my', module_text('FOO-MIB'))
+        self.assertEqual(MibLocator([os.path.join(self.tmp, 'second')]).find('FOO-MIB'), second)
+        # missing directories are skipped
+        locator.add_directory(os.path.join(self.tmp, 'missing'))
+        self.assertIsNone(locator.find('BAR-MIB'))
+
+    def test_extensions(self):
+        self.write('a/FOO-MIB.bak', module_text('FOO-MIB'))
+        upper = self.write('a/BAR-MIB.MY', module_text('BAR-MIB'))
+        locator = MibLocator([os.path.join(self.tmp, 'a')])
+        self.assertIsNone(locator.find('FOO-MIB'))
+        self.assertEqual(locator.find('BAR-MIB'), upper)
+        self.assertEqual(MibLocator([os.path.join(self.tmp, 'a')], extensions=['.bak']).find('FOO-MIB'),
+                         os.path.join(self.tmp, 'a', 'FOO-MIB.bak'))
+
+    def test_build_imports_from_mibs_dirs(self):
+        # RFC1155-SMI is imported from a file which isn't named by its module
+        shutil.copy(root / 'tests' / 'RFC1155-SMI.my', self.write('smi/rfc1155.txt', ''))
+        path = self.write('mibs/RFC1213-MIB.my', '')
+        shutil.copy(root / 'tests' / 'RFC1213-MIB.my', path)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            mibParser = MibParser(idrs_dict={'sysObjectID': path}, mibs_dirs=[os.path.join(self.tmp, 'smi')])
+        self.assertEqual(mibParser['internet'].module.name, 'RFC1155-SMI')
+
+
+if __name__ == '__main__':
+    unittest.main()
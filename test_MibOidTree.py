@@ -0,0 +1,57 @@
+import unittest
+
+from MibOidTree import OidTree, parse_oid, format_oid
+
+
+class OidTreeTest(unittest.TestCase):
+    def setUp(self):
+        self.tree = OidTree()
+        for name, oid in (('iso', '1'), ('internet', '1.3.6.1'), ('mib-2', '1.3.6.1.2.1'), ('system', '1.3.6.1.2.1.1'),
+                          ('sysObjectID', (1, 3, 6, 1, 2, 1, 1, 2)), ('sysDescr', '.1.3.6.1.2.1.1.1')):
+            self.tree.add(name, oid)
+
+    def test_lookup(self):
+        self.assertEqual(self.tree.name('1.3.6.1.2.1.1.2'), 'sysObjectID')
+        self.assertEqual(self.tree.name((1, 3, 6, 1)), 'internet')
+        # nodes between named oids have no name
+        self.assertIsNone(self.tree.name('1.3.6'))
+        self.assertIsNone(self.tree.name('1.3.6.1.4'))
+        self.assertEqual(self.tree.oid('sysDescr'), (1, 3, 6, 1, 2, 1, 1, 1))
+        self.assertIsNone(self.tree.oid('ifIndex'))
+        self.assertIn('system', self.tree)
+        self.assertEqual(len(self.tree), 6)
+
+    def test_first_name_is_kept(self):
+        self.tree.add('other', '1.3.6.1')
+        self.tree.add('sysObjectID', '1.3.6.1.4')
+        self.assertEqual(self.tree.name('1.3.6.1'), 'internet')
+        self.assertEqual(self.tree.oid('sysObjectID'), (1, 3, 6, 1, 2, 1, 1, 2))
+        self.assertEqual(self.tree.oid('other'), (1, 3, 6, 1))
+
+    def test_longest_prefix(self):
+        self.assertEqual(self.tree.longest_prefix('1.3.6.1.2.1.1.2.0'), ('sysObjectID', (0,)))
+        self.assertEqual(self.tree.longest_prefix('1.3.6.1.2.1.1.2'), ('sysObjectID', ()))
+        self.assertEqual(self.tree.longest_prefix('1.3.6.1.4.1.9'), ('internet', (4, 1, 9)))
+        self.assertIsNone(self.tree.longest_prefix('2.5'))
+
+    def test_iteration(self):
+        # depth first in oid order
+        self.assertEqual([node.name for node in self.tree],
+                         ['iso', 'internet', 'mib-2', 'system', 'sysDescr', 'sysObjectID'])
+        self.assertEqual([format_oid(node.oid) for node in self.tree.node('1.3.6.1.2.1.1')],
+                         ['1.3.6.1.2.1.1', '1.3.6.1.2.1.1.1', '1.3.6.1.2.1.1.2'])
+
+    def test_parse_oid(self):
+        self.assertEqual(parse_oid('1.3.6.1'), (1, 3, 6, 1))
+        self.assertEqual(parse_oid('.1.3.6.1'), (1, 3, 6, 1))
+        self.assertEqual(parse_oid([1, 3]), (1, 3))
+        for oid in ('', '.', '1..3', '1.3.', 'iso.3', '1.-3', ' 1.3', ()):
+            with self.subTest(oid=oid):
+                with self.assertRaisesRegex(ValueError, 'invalid oid'):
+                    parse_oid(oid)
+        with self.assertRaisesRegex(ValueError, 'invalid oid'):
+            self.tree.name('')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+from pathlib import Path
+
+from MibParser import MibParser, MibCorpus, MibObjectID, FAST_LOAD, FAST_SEARCH, HYBRID
+
+root = Path(__file__).resolve().parent
+algorithms = (FAST_LOAD, FAST_SEARCH, HYBRID)
+
+
+class MibParserTest(unittest.TestCase):
+    def setUp(self):
+        self._cwd = os.getcwd()
+        os.chdir(root)
+        self.tmp = tempfile.mkdtemp()
+        self._warnings = warnings.catch_warnings()
+        self._warnings.__enter__()
+        warnings.simplefilter('ignore')
+
+    def tearDown(self):
+        self._warnings.__exit__(None, None, None)
+        os.chdir(self._cwd)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def write(self, name: str, text: str) -> str:
+        path = os.path.join(self.tmp, name)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def test_write_and_eject(self):
+        mibParser = MibParser('written-mib', idrs_dict={'sysObjectID': 'tests/RFC1213-MIB.my'})
+        generated = []
+        iter_mib = mibParser.iter_mib
+        mibParser.iter_mib = lambda: generated.append(1) or iter_mib()
+        text = mibParser.eject_mib(self.tmp)
+        self.assertEqual(len(generated), 1)
+        self.assertTrue(text.startswith('written-mib DEFINITIONS ::= BEGIN\n') and text.endswith('\nEND'))
+        self.assertIn('sysObjectID OBJECT-TYPE', text)
+        with open(os.path.join(self.tmp, 'written-mib.my')) as f:
+            self.assertEqual(f.read(), text)
+
+        path = os.path.join(self.tmp, 'other.my')
+        mibParser.write_mib(path)
+        with open(path) as f:
+            self.assertEqual(f.read(), text)
+        with open(path, 'w') as f:
+            mibParser.write_mib(f)
+        with open(path) as f:
+            self.assertEqual(f.read(), text)
+        self.assertEqual(''.join(mibParser.iter_mib()), text)
+
+    def test_identifier_not_found(self):
+        # Access and Status are assigned in the macro bodies of RFC1155-SMI, they are not definitions
+        for fast_load in algorithms:
+            for idrName in ('Access', 'Status', 'noSuchName'):
+                with self.subTest(fast_load=fast_load, idrName=idrName):
+                    with self.assertRaisesRegex(ValueError, f'identifier {idrName} not found'):
+                        MibParser(idrs_list=[idrName], mibs_paths=['tests/RFC1155-SMI.my'], fast_load=fast_load)
+
+    def test_warm_corpus_searches_like_cold_corpus(self):
+        # the head of fooObject in the comment of B-MIB is found before its definition in A-MIB
+        mibs_paths = [self.write('B.my', 'B-MIB DEFINITIONS ::= BEGIN\n\n-- fooObject OBJECT-TYPE\n\nEND\n'),
+                      self.write('A.my', 'A-MIB DEFINITIONS ::= BEGIN\n\n'
+                                         'xObject OBJECT IDENTIFIER ::= { iso 3 }\n\n'
+                                         'fooObject OBJECT IDENTIFIER ::= { xObject 1 }\n\nEND\n')]
+        for fast_load in algorithms:
+            with self.subTest(fast_load=fast_load):
+                cold = MibCorpus(mibs_paths, fast_load=fast_load).build('b', ['fooObject']).eject_mib()
+                corpus = MibCorpus(mibs_paths, fast_load=fast_load)
+                corpus.build('a', ['xObject'])
+                self.assertEqual(corpus.build('b', ['fooObject']).eject_mib(), cold)
+                self.assertIn('fooObject OBJECT IDENTIFIER', cold)
+
+    def test_require_subtree(self):
+        top = self.write('A-MIB.my', 'A-MIB DEFINITIONS ::= BEGIN\n\ntop OBJECT IDENTIFIER ::= { iso 9 }\n\n'
+                                     'a1 OBJECT IDENTIFIER ::= { top 1 }\n\nEND\n')
+        self.write('B-MIB.my', 'B-MIB DEFINITIONS ::= BEGIN\n\nIMPORTS top FROM A-MIB;\n\n'
+                               'b1 OBJECT IDENTIFIER ::= { top 2 }\n\nb2 OBJECT IDENTIFIER ::= { b1 1 }\n\nEND\n')
+        # another definition of top, its children are not in the subtree
+        self.write('C-MIB.my', 'C-MIB DEFINITIONS ::= BEGIN\n\ntop OBJECT IDENTIFIER ::= { iso 8 }\n\n'
+                               'c1 OBJECT IDENTIFIER ::= { top 3 }\n\nEND\n')
+        mibs_paths = [os.path.join(self.tmp, '*.my')]
+        for fast_load in algorithms:
+            for cache_dir in (None, os.path.join(self.tmp, f'cache-{fast_load}')):
+                with self.subTest(fast_load=fast_load, cache_dir=cache_dir):
+                    mibParser = MibParser(mibs_paths=mibs_paths, fast_load=fast_load, cache_dir=cache_dir)
+                    self.assertEqual(mibParser.require_subtree('top', top), ['top', 'a1', 'b1', 'b2'])
+                    self.assertTrue(all(mibParser.parsed_identifiers[name] for name in ('top', 'a1', 'b1', 'b2')))
+                    self.assertNotIn('c1', mibParser)
+                    self.assertEqual(mibParser.require_subtree('noSuchName'), [])
+
+    def test_require_subtree_of_corpus(self):
+        for fast_load in algorithms:
+            tree = MibCorpus(['tests/*'], fast_load=fast_load).oid_tree()
+            for root in ('frxPort', 'dot1xPaeSystem', 'internet'):
+                with self.subTest(fast_load=fast_load, root=root):
+                    mibParser = MibParser(mibs_paths=['tests/*'], fast_load=fast_load)
+                    names = mibParser.require_subtree(root)
+                    self.assertEqual(names[0], root)
+                    self.assertEqual(sorted(names), sorted(node.name for node in tree.node(tree.oid(root))))
+                    self.assertTrue(all(mibParser.parsed_identifiers[name] for name in names))
+
+    def test_resolve_identifier(self):
+        mibParser = MibParser(mibs_paths=['tests/RFC1213-MIB.my'], fast_load=FAST_SEARCH)
+        module = mibParser.corpus.loaded_parsed_mibs['tests/RFC1213-MIB.my']
+        # the class of the definition is still the second positional argument
+        idr = module.resolve_identifier('sysObjectID', MibObjectID, mibParser=mibParser)
+        self.assertIs(idr, mibParser.parsed_identifiers['sysObjectID'])
+        self.assertIs(module.resolve_oidName('ifIndex', mibParser=mibParser), mibParser.parsed_identifiers['ifIndex'])
+        with self.assertRaises(TypeError):
+            module.resolve_identifier('sysObjectID', mibParser)
+
+    def test_deprecated_corpus_aliases(self):
+        mibParser = MibParser(mibs_paths=['tests/RFC1213-MIB.my'])
+        for name in ('fast_load', 'workers', 'low_memory', 'index', 'stats', 'loaded_parsed_mibs', 'loaded_text_mibs',
+                     'parsed_modules', 'parses_avoided'):
+            with self.subTest(name=name):
+                with self.assertWarns(DeprecationWarning):
+                    self.assertEqual(getattr(mibParser, name), getattr(mibParser.corpus, name))
+        with self.assertWarns(DeprecationWarning):
+            self.assertEqual(mibParser.get_module, mibParser.corpus.get_module)
+        self.assertEqual(MibParser.choose_algorithm([], 1), MibCorpus.choose_algorithm([], 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import json
+import os
+import unittest
+import warnings
+from pathlib import Path
+
+from MibParser import MibParser
+from MibStats import MibStats
+
+root = Path(__file__).resolve().parent
+
+
+class MibStatsTest(unittest.TestCase):
+    def setUp(self):
+        self._cwd = os.getcwd()
+        os.chdir(root)
+        self._warnings = warnings.catch_warnings()
+        self._warnings.__enter__()
+        warnings.simplefilter('ignore')
+
+    def tearDown(self):
+        self._warnings.__exit__(None, None, None)
+        os.chdir(self._cwd)
+
+    def build(self, stats: MibStats, **kwargs) -> MibParser:
+        return MibParser(idrs_list=['sysObjectID'], mibs_paths=['tests/RFC1213-MIB.my'], stats=stats, **kwargs)
+
+    def test_hooks(self):
+        events = []
+        stats = MibStats(hooks=[lambda event, data: events.append((event, data))])
+        late = []
+        stats.add_hook(lambda event, data: late.append(event))
+        with self.assertLogs('MibParser.stats', 'DEBUG') as logs:
+            self.build(stats)
+
+        self.assertEqual([event for event, data in events], late)
+        self.assertEqual(len(logs.records), len(events))
+        self.assertEqual({event for event, data in events}, {'module_parsed', 'scan', 'hit', 'miss',
+                                                             'identifier_resolved'})
+        parsed = [data['module'] for event, data in events if event == 'module_parsed']
+        self.assertEqual(parsed, ['RFC1213-MIB', 'RFC1155-SMI'])
+        resolved = {data['identifier']: data for event, data in events if event == 'identifier_resolved'}
+        self.assertEqual({name: data['depth'] for name, data in resolved.items()},
+                         {'sysObjectID': 0, 'system': 1, 'mib-2': 2, 'mgmt': 3, 'internet': 4})
+        # an identifier is reported after its dependencies
+        self.assertEqual(list(resolved), ['internet', 'mgmt', 'mib-2', 'system', 'sysObjectID'])
+
+    def test_latency(self):
+        stats = MibStats()
+        mibParser = self.build(stats)
+        seconds = {name: latency for name, (latency, depth) in stats.identifiers.items()}
+        # latency of an identifier includes its dependencies, its search and the parsing of the imported modules
+        self.assertEqual(sorted(seconds, key=seconds.get), ['internet', 'mgmt', 'mib-2', 'system', 'sysObjectID'])
+        self.assertGreaterEqual(seconds['sysObjectID'], stats.modules['RFC1155-SMI'][0])
+        self.assertTrue(all(seconds[name] >= stats.parse_times[name] > 0 for name in seconds))
+
+        # already parsed definitions are not parsed again, but resolving them still takes time
+        mibParser.corpus.build('other-mib', ['sysObjectID'])
+        self.assertEqual(stats.parse_times['sysObjectID'], 0.0)
+        self.assertGreater(stats.identifiers['sysObjectID'][0], 0.0)
+
+    def test_statistics(self):
+        stats = MibStats()
+        self.build(stats)
+        self.assertEqual(set(stats.modules), {'RFC1213-MIB', 'RFC1155-SMI'})
+        self.assertEqual(stats.modules['RFC1213-MIB'][1], os.path.getsize('tests/RFC1213-MIB.my'))
+        self.assertEqual(stats.scans['heads'], 1)
+        self.assertEqual(stats.scans['identifier'], 5)
+        self.assertEqual(stats.misses['identifiers'], 5)
+        self.assertEqual(stats.identifiers['sysObjectID'][1], 0)
+        data = json.loads(json.dumps(stats.as_dict()))
+        self.assertEqual(set(data), {'modules', 'scans', 'hits', 'misses', 'identifiers'})
+        self.assertEqual(data['identifiers']['internet']['depth'], 4)
+        self.assertEqual(data['identifiers']['internet']['parse_seconds'], stats.parse_times['internet'])
+
+    def test_registry_hits(self):
+        stats = MibStats()
+        mibParser = self.build(stats)
+        mibParser.corpus.build('other-mib', ['ifIndex'])
+        # RFC1155-SMI is imported again from the registry and already parsed definitions are reused
+        self.assertGreater(stats.hits['registry'], 0)
+        self.assertGreater(stats.hits['identifiers'], 0)
+        self.assertEqual(set(stats.modules), {'RFC1213-MIB', 'RFC1155-SMI'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+regression tests of the built modules. run from the repository root by:
+
+    python -m pytest -q test_regression.py
+
+the demo modules in tests are the reference output: every algorithm and option must build them byte for byte.
+"""
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import warnings
+from pathlib import Path
+
+from MibParser import MibParser, HYBRID
+
+root = Path(__file__).resolve().parent
+loading_idrs = ['TimeTicks', 'frxT1OutOctets', 'dot1xPaeSystemAuthControl', 'frxH6EsTx']
+# source mibs of the demo modules
+source_mibs = ['RFC1155-SMI.my', 'RFC1213-MIB.my', 'CISCO-90-MIB-V1SMI.my', 'IEEE8021-PAE-MIB-V1SMI.my']
+
+
+def read(name: str) -> str:
+    with open(root / 'tests' / name) as f:
+        return f.read()
+
+
+def build_loading(**kwargs) -> str:
+    """ text of the loading demo module built with the given MibParser arguments """
+    return MibParser('test-loading-mib', idrs_list=loading_idrs, mibs_paths=['tests/*'], **kwargs).eject_mib()
+
+
+class RegressionTest(unittest.TestCase):
+    def setUp(self):
+        # the demo paths are relative to the repository root
+        self._cwd = os.getcwd()
+        os.chdir(root)
+        self.tmp = tempfile.mkdtemp()
+        logging.disable(logging.CRITICAL)
+        warnings.simplefilter('ignore')
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+        logging.disable(logging.NOTSET)
+        warnings.resetwarnings()
+
+    def test_demo_modules(self):
+        idrs_dict = {'dot1xPaeSystemAuthControl': 'tests/IEEE8021-PAE-MIB-V1SMI.my'}
+        mibParser = MibParser('test-dict-mib', idrs_dict=idrs_dict)
+        self.assertEqual(mibParser.eject_mib(), read('test-dict-mib.my'))
+        self.assertEqual(build_loading(), read('test-loading-mib.my'))
+
+    def test_same_module_by_all_options(self):
+        expected = read('test-loading-mib.my')
+        options = [dict(fast_load=fast_load, **option) for fast_load in (True, False, HYBRID)
+                   for option in ({}, {'low_memory': True}, {'io_workers': 4}, {'base_smi': True})]
+        options += [{'fast_load': False, 'workers': 2}, {'fast_load': None}]
+        for option in options:
+            with self.subTest(**option):
+                self.assertEqual(build_loading(**option), expected)
+        for fast_load in (True, False, HYBRID):
+            cache_dir = os.path.join(self.tmp, f'cache-{fast_load}')
+            # cold cache and then warm cache
+            for run in ('cold', 'warm'):
+                with self.subTest(fast_load=fast_load, cache_dir=run):
+                    self.assertEqual(build_loading(fast_load=fast_load, cache_dir=cache_dir), expected)
+
+    def test_incremental_rebuild(self):
+        mibs_dir = os.path.join(self.tmp, 'mibs')
+        os.makedirs(mibs_dir)
+        for name in source_mibs:
+            shutil.copy(root / 'tests' / name, mibs_dir)
+        mibs_paths = [os.path.join(mibs_dir, '*')]
+        build_manifest = os.path.join(self.tmp, 'build.json')
+        steps = [loading_idrs, loading_idrs + ['sysObjectID', 'ifIndex'], ['ifIndex', 'frxT1OutOctets', 'frxPort'],
+                 ['frxPort', 'dot1xPaeSystem'], ['dot1xPaeSystem', 'TimeTicks']]
+        for fast_load in (True, False, HYBRID):
+            for step, idrs_list in enumerate(steps):
+                if step == 3:
+                    # content of a used file changes, its definitions are resolved again
+                    with open(os.path.join(mibs_dir, 'CISCO-90-MIB-V1SMI.my'), 'a') as f:
+                        f.write(f'\n-- changed {fast_load}\n')
+                with self.subTest(fast_load=fast_load, step=step):
+                    rebuilt = MibParser('incremental-mib', idrs_list=idrs_list, mibs_paths=mibs_paths,
+                                        fast_load=fast_load, build_manifest=build_manifest)
+                    clean = MibParser('incremental-mib', idrs_list=idrs_list, mibs_paths=mibs_paths,
+                                      fast_load=fast_load)
+                    self.assertEqual(rebuilt.eject_mib(), clean.eject_mib())
+            os.remove(build_manifest)
+
+    def test_deep_chain(self):
+        # oid chain longer than the recursion limit, each oid defined under the previous one
+        depth = sys.getrecursionlimit() + 100
+        definitions = ['chain0 OBJECT IDENTIFIER ::= { iso 3 }']
+        definitions += [f'chain{i} OBJECT IDENTIFIER ::= {{ chain{i - 1} 1 }}' for i in range(1, depth)]
+        path = os.path.join(self.tmp, 'DEEP-CHAIN-MIB.my')
+        with open(path, 'w') as f:
+            f.write('DEEP-CHAIN-MIB DEFINITIONS ::= BEGIN\n\n' + '\n\n'.join(definitions) + '\n\nEND\n')
+        for fast_load in (True, False, HYBRID):
+            with self.subTest(fast_load=fast_load):
+                mibParser = MibParser('deep-mib', idrs_dict={f'chain{depth - 1}': path}, fast_load=fast_load)
+                built = [name for name, idr in mibParser.parsed_identifiers.items() if idr]
+                self.assertEqual(built, [f'chain{i}' for i in reversed(range(depth))])
+                self.assertEqual(mibParser.oid_tree().oid(f'chain{depth - 1}'), (1, 3) + (1,) * (depth - 1))
+
+
+if __name__ == '__main__':
+    unittest.main()